@@ -1,3 +1,5 @@
+from secrets import compare_digest
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from .config import settings
@@ -5,13 +7,17 @@ from .config import settings
 
 security = HTTPBasic()
 
+# Settings are frozen at import, so resolve the expected credentials once
+_AUTH_ON = settings.basic_auth_enabled
+_EXPECTED_USER = settings.basic_auth_username.encode()
+_EXPECTED_PASS = settings.basic_auth_password.encode()
+
 
 def basic_auth(credentials: HTTPBasicCredentials = Depends(security)):
-    if not settings.basic_auth_enabled:
+    if not _AUTH_ON:
         return
-    correct_user = settings.basic_auth_username
-    correct_pass = settings.basic_auth_password
-    if credentials.username != correct_user or credentials.password != correct_pass:
+    # Constant-time compares; "&" makes sure both always run
+    user_ok = compare_digest(credentials.username.encode(), _EXPECTED_USER)
+    pass_ok = compare_digest(credentials.password.encode(), _EXPECTED_PASS)
+    if not (user_ok & pass_ok):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
-
-
@@ -1,34 +1,62 @@
 import os
-import json
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    def __init__(self) -> None:
-        self.basic_auth_enabled = os.getenv("NETVIEW_BASIC_AUTH_ENABLED", "false").lower() == "true"
-        self.basic_auth_username = os.getenv("NETVIEW_BASIC_AUTH_USERNAME", "")
-        self.basic_auth_password = os.getenv("NETVIEW_BASIC_AUTH_PASSWORD", "")
-        # Polling intervals in seconds
-        self.discovery_interval_sec = int(os.getenv("NETVIEW_DISCOVERY_INTERVAL_SEC", "300"))
-        self.polling_interval_sec = int(os.getenv("NETVIEW_POLLING_INTERVAL_SEC", "60"))
-        
-        # SNMP configuration
-        self.snmp_community = os.getenv("NETVIEW_SNMP_COMMUNITY", "public")
-        self.snmp_timeout = int(os.getenv("NETVIEW_SNMP_TIMEOUT", "1"))
-        self.snmp_retries = int(os.getenv("NETVIEW_SNMP_RETRIES", "1"))
-        
-        # Network scan configuration - use full network ranges for hybrid discovery
-        scan_networks = os.getenv("NETVIEW_SCAN_NETWORKS", "192.168.1.0/24,192.168.0.0/24,10.0.0.0/24")
-        self.scan_networks = [net.strip() for net in scan_networks.split(',')]
-        
-        # Get SNMP config for services
-        self.snmp_config = {
+    basic_auth_enabled: bool
+    basic_auth_username: str
+    basic_auth_password: str = field(repr=False)
+    # Polling intervals in seconds
+    discovery_interval_sec: int
+    polling_interval_sec: int
+    # Devices probed for model/type details at once during a discovery pass
+    discovery_concurrency: int
+
+    # SNMP configuration
+    snmp_community: str
+    snmp_timeout: int
+    snmp_retries: int
+
+    # Network scan configuration - use full network ranges for hybrid discovery
+    scan_networks: Tuple[str, ...]
+
+    # Root log level for the app's loggers
+    log_level: str
+
+    # Read-only SNMP config shared by services, built once at import
+    snmp_config: Mapping[str, Any] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "snmp_config", MappingProxyType({
             'community': self.snmp_community,
             'timeout': self.snmp_timeout,
             'retries': self.snmp_retries,
-            'scan_networks': self.scan_networks
-        }
+            'scan_networks': self.scan_networks,
+            'discovery_concurrency': self.discovery_concurrency
+        }))
 
 
-settings = Settings()
+def _load() -> Settings:
+    """Read environment variables once at import"""
+    env = os.environ
+    scan_networks = env.get("NETVIEW_SCAN_NETWORKS", "192.168.1.0/24,192.168.0.0/24,10.0.0.0/24")
+    return Settings(
+        basic_auth_enabled=env.get("NETVIEW_BASIC_AUTH_ENABLED", "false").lower() == "true",
+        basic_auth_username=env.get("NETVIEW_BASIC_AUTH_USERNAME", ""),
+        basic_auth_password=env.get("NETVIEW_BASIC_AUTH_PASSWORD", ""),
+        discovery_interval_sec=int(env.get("NETVIEW_DISCOVERY_INTERVAL_SEC", "300")),
+        polling_interval_sec=int(env.get("NETVIEW_POLLING_INTERVAL_SEC", "60")),
+        discovery_concurrency=int(env.get("NETVIEW_DISCOVERY_CONCURRENCY", "64")),
+        snmp_community=env.get("NETVIEW_SNMP_COMMUNITY", "public"),
+        snmp_timeout=int(env.get("NETVIEW_SNMP_TIMEOUT", "1")),
+        snmp_retries=int(env.get("NETVIEW_SNMP_RETRIES", "1")),
+        scan_networks=tuple(net.strip() for net in scan_networks.split(',')),
+        log_level=env.get("NETVIEW_LOG_LEVEL", "INFO").upper(),
+    )
 
 
+settings = _load()
+SNMP_CONFIG = settings.snmp_config
@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from typing import Generator
 
-from .models import SessionLocal, init_db
+from .models import SessionLocal, engine, init_db
 
 
 def initialize_database() -> None:
@@ -12,7 +12,16 @@ def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+def get_ro_conn() -> Generator:
+    """Pooled Core connection for read-only endpoints that don't need the ORM"""
+    with engine.connect() as conn:
+        yield conn
+
+
@@ -1,13 +1,23 @@
+import gzip
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from typing import Any, Dict, Tuple
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.exposition import choose_encoder
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import Response
 
 from .routers import devices, interfaces, topology, alerts, metrics as metrics_router, oui, user_settings
 from .scheduler import start_scheduler
 from .metrics import registry, http_requests_total
 from .db import initialize_database
+from .responses import ORJSONResponse
+from .config import settings
+
+
+logging.basicConfig(level=settings.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 
 @asynccontextmanager
@@ -20,18 +30,34 @@ async def lifespan(app: FastAPI):
     pass
 
 
-app = FastAPI(title="NetView", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="NetView",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Routes are registered without trailing slashes; skip the 307 redirect lookup
+    redirect_slashes=False,
+)
 
 """Metrics are centrally declared in app.metrics"""
 
 
+# Resolved counter children keyed by (method, route path, status)
+_label_cache: Dict[Tuple[str, str, str], Any] = {}
+
+
 @app.middleware("http")
 async def metrics_middleware(request, call_next):
     response = await call_next(request)
     try:
-        http_requests_total.labels(
-            method=request.method, path=request.url.path, status=str(response.status_code)
-        ).inc()
+        # Use the route template so path label cardinality stays bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        key = (request.method, path, str(response.status_code))
+        child = _label_cache.get(key)
+        if child is None:
+            child = _label_cache.setdefault(key, http_requests_total.labels(*key))
+        child.inc()
     except Exception:
         pass
     return response
@@ -47,9 +73,15 @@ app.add_middleware(
 
 
 @app.get("/metrics")
-def metrics():
-    data = generate_latest(registry)
-    return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+async def metrics(request: Request):
+    # Rendering a large registry is CPU-bound; keep it off the event loop
+    encoder, content_type = choose_encoder(request.headers.get("accept"))
+    data = await run_in_threadpool(encoder, registry)
+    headers = {}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        data = gzip.compress(data, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=data, media_type=content_type, headers=headers)
 
 
 app.include_router(devices.router, prefix="/devices", tags=["devices"])
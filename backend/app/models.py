@@ -1,20 +1,61 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, create_engine
+import orjson
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, create_engine, event, func
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.types import TypeDecorator
 
 
 DATABASE_URL = "sqlite:///./netview.db"
 
+# Explicit pool so FastAPI's threadpool reuses connections instead of reopening the file
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=False,
+    pool_recycle=3600,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while discovery writes; page_size only takes
+    # effect on a fresh file, so it has to come before journal_mode
+    cursor = dbapi_connection.cursor()
+    cursor.executescript(
+        "PRAGMA page_size=8192;"
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA busy_timeout=30000;"
+        "PRAGMA cache_size=-20000;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA temp_store=MEMORY;"
+    )
+    cursor.close()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
 
+class FastJSON(TypeDecorator):
+    """JSON stored as compact TEXT (readable by SQLite JSON1), encoded with orjson"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return orjson.dumps(value).decode() if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return orjson.loads(value) if value is not None else None
+
+
 class Device(Base):
     __tablename__ = "devices"
     id = Column(String, primary_key=True)
@@ -22,38 +63,50 @@ class Device(Base):
     mgmt_ip = Column(String, index=True)
     vendor = Column(String)
     model = Column(String)
-    roles = Column(JSON, default=list)
+    roles = Column(FastJSON, default=list)
     status = Column(String, default="unknown")
-    last_seen = Column(DateTime, default=datetime.utcnow)
+    # The Python default stamps rows in databases created before the server default existed
+    last_seen = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     connection_type = Column(String, default="Unknown")
     ip_version = Column(String, default="IPv4")
     device_name = Column(String)
     interfaces = relationship("Interface", back_populates="device")
 
 
+# Expression index so gateway lookups (mgmt_ip ending in ".1") avoid a table scan
+Index("ix_device_gateway", func.substr(Device.mgmt_ip, -2))
+
+
 class Interface(Base):
     __tablename__ = "interfaces"
+    __table_args__ = (
+        Index("ix_iface_dev_if", "device_id", "if_index", unique=True),
+    )
     id = Column(String, primary_key=True)
-    device_id = Column(String, ForeignKey("devices.id"), index=True)
-    if_index = Column(Integer, index=True)
+    device_id = Column(String, ForeignKey("devices.id"))
+    if_index = Column(Integer)
     name = Column(String)
     speed = Column(Integer)
     mac = Column(String)
     admin_status = Column(String)
     oper_status = Column(String)
-    last_counters = Column(JSON, default=dict)
+    last_counters = Column(FastJSON, default=dict)
     device = relationship("Device", back_populates="interfaces")
 
 
 class Edge(Base):
     __tablename__ = "edges"
+    __table_args__ = (
+        Index("ix_edge_src_dev_if", "src_device_id", "src_if_index"),
+        Index("ix_edge_dst_dev_if", "dst_device_id", "dst_if_index"),
+    )
     id = Column(String, primary_key=True)
-    src_device_id = Column(String, index=True)
+    src_device_id = Column(String)
     src_if_index = Column(Integer)
-    dst_device_id = Column(String, index=True)
+    dst_device_id = Column(String)
     dst_if_index = Column(Integer)
     link_type = Column(String)
-    vlan_tags = Column(JSON, default=list)
+    vlan_tags = Column(FastJSON, default=list)
     confidence = Column(Integer, default=100)
 
 
@@ -65,11 +118,21 @@ class UserSettings(Base):
     model = Column(String)
     hostname = Column(String)
     notes = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes on tables that already exist; read sqlite_master
+    # directly since reflection does not report expression indexes
+    with engine.begin() as conn:
+        existing = {
+            name for (name,) in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn)
 
 
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from ..db import get_db
+from ..db import get_db, get_ro_conn
 from ..models import Device
+from ..responses import ORJSONResponse
+from ..services.topology_cache import topology_cache
 
 router = APIRouter()
 
@@ -17,10 +20,22 @@ class DeviceCreate(BaseModel):
     status: str = "up"
 
 
-@router.get("")
-def list_devices(db: Session = Depends(get_db)) -> List[dict]:
-    devices = db.query(Device).all()
-    return [
+@router.get("", response_class=ORJSONResponse)
+def list_devices(db: Connection = Depends(get_ro_conn)) -> ORJSONResponse:
+    # Column-only select skips ORM object construction; datetimes are left to orjson
+    rows = db.execute(
+        select(
+            Device.id,
+            Device.hostname,
+            Device.mgmt_ip,
+            Device.vendor,
+            Device.model,
+            Device.status,
+            Device.last_seen,
+        )
+    ).all()
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return ORJSONResponse([
         {
             "id": d.id,
             "hostname": d.hostname,
@@ -28,10 +43,10 @@ def list_devices(db: Session = Depends(get_db)) -> List[dict]:
             "vendor": d.vendor,
             "model": d.model,
             "status": d.status,
-            "lastSeen": d.last_seen.isoformat() if d.last_seen else None,
+            "lastSeen": d.last_seen,
         }
-        for d in devices
-    ]
+        for d in rows
+    ])
 
 
 @router.post("")
@@ -52,6 +67,7 @@ def create_device(device: DeviceCreate, db: Session = Depends(get_db)) -> dict:
     )
     db.add(new_device)
     db.commit()
+    topology_cache.invalidate()
     db.refresh(new_device)
     
     return {
@@ -73,6 +89,7 @@ def delete_device(device_id: str, db: Session = Depends(get_db)) -> dict:
     
     db.delete(device)
     db.commit()
+    topology_cache.invalidate()
     return {"message": f"Device {device_id} deleted successfully"}
 
 
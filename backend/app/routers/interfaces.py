@@ -1,16 +1,29 @@
 from fastapi import APIRouter, Depends
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_ro_conn
 from ..models import Interface
+from ..responses import ORJSONResponse
 
 router = APIRouter()
 
 
-@router.get("")
-def list_interfaces(db: Session = Depends(get_db)) -> List[dict]:
-    ifaces = db.query(Interface).all()
-    return [
+@router.get("", response_class=ORJSONResponse)
+def list_interfaces(db: Connection = Depends(get_ro_conn)) -> ORJSONResponse:
+    ifaces = db.execute(
+        select(
+            Interface.id,
+            Interface.device_id,
+            Interface.if_index,
+            Interface.name,
+            Interface.speed,
+            Interface.mac,
+            Interface.admin_status,
+            Interface.oper_status,
+        )
+    ).all()
+    return ORJSONResponse([
         {
             "id": i.id,
             "deviceId": i.device_id,
@@ -22,13 +35,13 @@ def list_interfaces(db: Session = Depends(get_db)) -> List[dict]:
             "operStatus": i.oper_status,
         }
         for i in ifaces
-    ]
+    ])
 
 
-@router.get("/{device_id}")
-def list_interfaces_for_device(device_id: str, db: Session = Depends(get_db)) -> List[dict]:
+@router.get("/{device_id}", response_class=ORJSONResponse)
+def list_interfaces_for_device(device_id: str, db: Session = Depends(get_db)) -> ORJSONResponse:
     ifaces = db.query(Interface).filter(Interface.device_id == device_id).all()
-    return [
+    return ORJSONResponse([
         {
             "id": i.id,
             "deviceId": i.device_id,
@@ -40,7 +53,7 @@ def list_interfaces_for_device(device_id: str, db: Session = Depends(get_db)) ->
             "operStatus": i.oper_status,
         }
         for i in ifaces
-    ]
+    ])
 
 
 @router.get("/{device_id}/{if_index}")
@@ -1,42 +1,131 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import logging
+import platform
+import re
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
-from ..db import get_db
+from starlette.concurrency import run_in_threadpool
+from ..db import get_db, get_ro_conn, SessionLocal
 from ..models import Device, Interface, Edge
-from ..services.discovery import DiscoveryService
-from ..services.snmp import SnmpClient
-from ..services.fast_discovery import FastDiscoveryService
+from ..responses import ORJSONResponse
+from ..services.discovery import get_discovery_service
+from ..services.topology_cache import topology_cache
+
+# Optional icmplib import
+try:
+    from icmplib import async_ping
+    HAS_ICMPLIB = True
+except ImportError:
+    HAS_ICMPLIB = False
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# ping -W is milliseconds on macOS and seconds on Linux
+_PING_WAIT = '2000' if platform.system() == "Darwin" else '2'
+
+# Discovery services are stateless per config, so share one set across requests
+_discovery_service = get_discovery_service()
+_fast_discovery = _discovery_service.fast_discovery
+_discovery_task: Optional[asyncio.Task] = None
+
+# Serializes /topology rebuilds on a cache miss
+_topology_build_lock = threading.Lock()
+
+# Probing for a missing router pings the LAN; don't repeat it on every request
+ROUTER_CHECK_TTL_SEC = 60
+_last_router_check: float = 0.0
+
+# Router/gateway matchers, built once at import
+ROUTER_VENDORS = frozenset([
+    'cisco', 'netgear', 'linksys', 'tp-link', 'd-link', 'asus',
+    'belkin', 'buffalo', 'zyxel', 'ubiquiti', 'mikrotik',
+    'aruba', 'ruckus', 'meraki', 'fortinet', 'sonicwall'
+])
+ROUTER_HOSTNAME_RE = re.compile(r'router|gateway|ap-|wifi|wireless', re.IGNORECASE)
+
 
-@router.get("")
 @router.head("")
-def get_topology(db: Session = Depends(get_db)) -> dict:
+def head_topology(db: Connection = Depends(get_ro_conn)) -> Response:
+    """Liveness probe for /topology: touch the DB but build no body"""
+    db.execute(select(func.count(Device.id))).scalar()
+    return Response(status_code=200)
+
+
+# The body is already-encoded JSON, so it goes out as a plain Response
+@router.get("", response_class=Response, responses={200: {"content": {"application/json": {}}}})
+def get_topology(db: Connection = Depends(get_ro_conn)) -> Response:
+    return Response(content=_topology_body(db), media_type="application/json")
+
+
+def _topology_body(db: Connection) -> bytes:
+    """Build the topology and return it as encoded JSON"""
     # Skip router detection for now to avoid blocking UI
     # _add_missing_router(db)
     
-    devices = db.query(Device).all()
-    edges = db.query(Edge).all()
+    # Cheap fingerprint of the devices table; discovery writes also invalidate explicitly
+    cache_key = tuple(db.execute(select(func.max(Device.last_seen), func.count(Device.id))).one())
+    # The cache holds the encoded body, so a hit skips serialization entirely
+    cached = topology_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Concurrent polls that miss together wait for one build instead of each running it
+    with _topology_build_lock:
+        cached = topology_cache.get(cache_key)
+        if cached is None:
+            cached = _encode_topology(db)
+            topology_cache.set(cache_key, cached)
+        return cached
+
+
+def _encode_topology(db: Connection) -> bytes:
+    """Query devices and edges and encode the topology payload"""
+    # First non-empty interface MAC per device, resolved in the same query
+    first_mac = (
+        select(Interface.mac)
+        .where(Interface.device_id == Device.id, Interface.mac.isnot(None), Interface.mac != "")
+        .order_by(Interface.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    # Read-only: plain column selects, no ORM identity map
+    devices = db.execute(
+        select(
+            Device.id,
+            Device.hostname,
+            Device.mgmt_ip,
+            Device.vendor,
+            Device.model,
+            Device.status,
+            Device.last_seen,
+            Device.connection_type,
+            Device.ip_version,
+            Device.device_name,
+            first_mac.label("mac"),
+        )
+    ).all()
+    edges = db.execute(select(Edge.id, Edge.src_device_id, Edge.dst_device_id)).all()
 
     # Identify router/gateway device
     router_device = None
     other_devices = []
     
     for d in devices:
-        # Get MAC address from first interface
-        mac_address = "Unknown"
-        if d.interfaces:
-            for interface in d.interfaces:
-                if interface.mac:
-                    mac_address = interface.mac
-                    break
-        
         device_info = {
             "id": d.id,
             "label": d.hostname or d.id,
             "title": d.mgmt_ip,
             "group": d.vendor or "device",
-            "mac": mac_address,
+            "mac": d.mac or "Unknown",
             "model": d.model or "Unknown",
             "status": d.status or "up",
             "lastSeen": d.last_seen.isoformat() if d.last_seen else None,
@@ -65,146 +154,158 @@ def get_topology(db: Session = Depends(get_db)) -> dict:
         }
         for e in edges
     ]
-    return {"nodes": node_items, "edges": edge_items}
+    topology = {"nodes": node_items, "edges": edge_items}
+    return ORJSONResponse(topology).body
 
 
 def _is_router_device(device: Device) -> bool:
     """Identify if a device is likely a router/gateway"""
-    import ipaddress
-    
     # Check if IP is a common gateway IP (usually .1 in the subnet)
-    try:
-        ip = ipaddress.IPv4Address(device.mgmt_ip)
-        # Check if it's a .1 address (common gateway pattern)
-        if str(ip).endswith('.1'):
-            return True
-    except (ipaddress.AddressValueError, ValueError):
-        pass
-    
+    if device.mgmt_ip and device.mgmt_ip.endswith('.1'):
+        return True
+
     # Check vendor names that are commonly routers
-    router_vendors = [
-        'cisco', 'netgear', 'linksys', 'tp-link', 'd-link', 'asus', 
-        'belkin', 'buffalo', 'zyxel', 'ubiquiti', 'mikrotik',
-        'aruba', 'ruckus', 'meraki', 'fortinet', 'sonicwall'
-    ]
-    
-    if device.vendor and device.vendor.lower() in router_vendors:
+    if device.vendor and device.vendor.lower() in ROUTER_VENDORS:
         return True
-    
+
     # Check hostname patterns
-    if device.hostname:
-        hostname_lower = device.hostname.lower()
-        router_patterns = ['router', 'gateway', 'ap-', 'wifi', 'wireless']
-        if any(pattern in hostname_lower for pattern in router_patterns):
-            return True
-    
+    if device.hostname and ROUTER_HOSTNAME_RE.search(device.hostname):
+        return True
+
     return False
 
-def _add_missing_router(db: Session) -> Device:
+async def _ping_router(router_ip: str) -> bool:
+    """Send a single ICMP echo to router_ip without blocking the event loop"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            'ping', '-c', '1', '-W', _PING_WAIT, router_ip,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except Exception as e:
+        logger.warning("Could not ping router %s: %s", router_ip, e)
+        return False
+    try:
+        return await asyncio.wait_for(proc.wait(), timeout=5) == 0
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False
+
+
+async def _ping_routers(router_ips: List[str]) -> List[bool]:
+    """Ping all router_ips in one concurrent round, preserving input order"""
+    if not router_ips:
+        return []
+    if HAS_ICMPLIB:
+        # Unprivileged ICMP sockets: no fork/exec per host
+        hosts = await asyncio.gather(
+            *(async_ping(ip, count=1, timeout=1, privileged=False) for ip in router_ips),
+            return_exceptions=True
+        )
+        errors = [h for h in hosts if isinstance(h, Exception)]
+        if not errors:
+            return [host.is_alive for host in hosts]
+        logger.debug("icmplib ping failed, falling back to ping command: %s", errors[0])
+    return list(await asyncio.gather(*(_ping_router(ip) for ip in router_ips)))
+
+
+async def _add_missing_router(db: Session) -> Optional[Device]:
     """Add the router device if it's not discovered but should exist"""
-    import ipaddress
-    
-    print("🔍 Checking for missing router...")
+    global _last_router_check
+    now = time.monotonic()
+    if now - _last_router_check < ROUTER_CHECK_TTL_SEC:
+        return None
+    _last_router_check = now
+    logger.debug("Checking for missing router...")
     
     # Check if we already have a router device
-    existing_router = db.query(Device).filter(
-        Device.mgmt_ip.like('%.1')
-    ).first()
+    router_exists = db.query(
+        db.query(Device).filter(func.substr(Device.mgmt_ip, -2) == '.1').exists()
+    ).scalar()
     
-    if existing_router:
-        print(f"✅ Router already exists: {existing_router.mgmt_ip}")
-        return existing_router
+    if router_exists:
+        logger.debug("Router already exists")
+        return None
     
     # Try to add common router IPs that might not be in ARP table
     common_router_ips = ['192.168.1.1', '192.168.0.1', '10.0.0.1', '172.16.0.1']
-    print(f"🔍 Testing router IPs: {common_router_ips}")
+    known_ips = {
+        ip for (ip,) in db.query(Device.mgmt_ip).filter(Device.mgmt_ip.in_(common_router_ips))
+    }
+    candidates = [ip for ip in common_router_ips if ip not in known_ips]
+    logger.debug("Testing router IPs: %s", candidates)
     
-    for router_ip in common_router_ips:
-        print(f"🔍 Testing router IP: {router_ip}")
-        
-        # Check if this IP is already in the database
-        existing_device = db.query(Device).filter(Device.mgmt_ip == router_ip).first()
-        if existing_device:
-            print(f"⚠️  Router {router_ip} already exists in database")
-            continue
-            
-        # Try to ping the router to see if it exists
-        try:
-            import subprocess
-            import platform
-            
-            print(f"🏓 Pinging {router_ip}...")
-            
-            # Use correct ping command for different platforms
-            if platform.system() == "Darwin":  # macOS
-                result = subprocess.run(['ping', '-c', '1', '-W', '2000', router_ip], 
-                                      capture_output=True, text=True, timeout=5)
-            else:  # Linux
-                result = subprocess.run(['ping', '-c', '1', '-W', '2', router_ip], 
-                                      capture_output=True, text=True, timeout=5)
-            
-            print(f"🏓 Ping result for {router_ip}: returncode={result.returncode}")
-            
-            if result.returncode == 0:
-                # Router is reachable, add it to database
-                router_device = Device(
-                    id=router_ip,
-                    hostname=f"router-{router_ip.split('.')[-1]}",
-                    mgmt_ip=router_ip,
-                    vendor="Router",
-                    model="Unknown Router",
-                    status="up"
-                )
-                db.add(router_device)
-                db.commit()
-                print(f"✅ Added missing router: {router_ip}")
-                return router_device
-            else:
-                print(f"❌ Router {router_ip} not reachable")
-        except Exception as e:
-            print(f"❌ Could not ping router {router_ip}: {e}")
+    # Ping all candidates at once; the first reachable one in list order wins
+    results = await _ping_routers(candidates)
+    for router_ip, reachable in zip(candidates, results):
+        if not reachable:
+            logger.debug("Router %s not reachable", router_ip)
             continue
+        router_device = Device(
+            id=router_ip,
+            hostname=f"router-{router_ip.split('.')[-1]}",
+            mgmt_ip=router_ip,
+            vendor="Router",
+            model="Unknown Router",
+            status="up"
+        )
+        db.add(router_device)
+        db.commit()
+        topology_cache.invalidate()
+        logger.info("Added missing router: %s", router_ip)
+        return router_device
     
     return None
 
-@router.get("/network-status")
-def get_network_status() -> dict:
+@router.get("/network-status", response_class=ORJSONResponse)
+async def get_network_status() -> ORJSONResponse:
     """Get current network connectivity status"""
-    from ..config import settings
-    fast_discovery = FastDiscoveryService(config=settings.snmp_config)
-    # Always run a fresh connectivity check
-    fast_discovery._check_network_connectivity()
-    return fast_discovery.get_network_status()
-
-@router.post("/discover")
-async def trigger_discovery(db: Session = Depends(get_db), force_refresh: bool = False) -> dict:
-    import asyncio
-    from ..config import settings
-    
-    # Return immediately with current topology
-    current_topology = get_topology(db)
-    
+    # The service reuses a recent result itself; a fresh check blocks, so run it off the event loop
+    status = await run_in_threadpool(_fast_discovery._check_network_connectivity)
+    return ORJSONResponse(status)
+
+
+def _with_topology(payload: dict, topology_body: bytes) -> Response:
+    """Encode payload with the already-encoded topology spliced in as current_topology"""
+    body = ORJSONResponse(payload).body
+    return Response(
+        content=body[:-1] + b',"current_topology":' + topology_body + b'}',
+        media_type="application/json"
+    )
+
+@router.post("/discover", response_class=Response, responses={200: {"content": {"application/json": {}}}})
+async def trigger_discovery(db: Session = Depends(get_db), force_refresh: bool = False) -> Response:
+    global _discovery_task
+
+    # Return immediately with current topology; the build may wait on the build lock,
+    # so it runs off the event loop
+    current_topology = await run_in_threadpool(_topology_body, db)
+
+    # Coalesce concurrent requests onto the discovery that is already running
+    if _discovery_task is not None and not _discovery_task.done():
+        return _with_topology({
+            "status": "already_running",
+            "message": "Discovery already in progress. UI will update automatically."
+        }, current_topology)
+
     # Start discovery in background (non-blocking)
     async def background_discovery():
+        # The request session is closed once we return, so use our own
+        bg_db = SessionLocal()
         try:
-            print("🚀 Starting background discovery...")
-            fast_discovery = FastDiscoveryService(config=settings.snmp_config)
-            from ..services.discovery import DiscoveryService
-            from ..services.snmp import SnmpClient
-            snmp_client = SnmpClient(config=settings.snmp_config)
-            svc = DiscoveryService(snmp_client, fast_discovery)
-            await svc.run_discovery(db, force_refresh)
-            print("✅ Background discovery completed")
+            logger.debug("Starting background discovery...")
+            await _discovery_service.run_discovery(bg_db, force_refresh)
+            logger.debug("Background discovery completed")
         except Exception as e:
-            print(f"❌ Background discovery failed: {e}")
-    
-    # Start background task
-    asyncio.create_task(background_discovery())
-    
-    return {
-        "status": "discovery_started",
-        "message": "Discovery started in background. UI will update automatically.",
-        "current_topology": current_topology
-    }
+            logger.warning("Background discovery failed: %s", e)
+        finally:
+            bg_db.close()
 
+    # Start background task
+    _discovery_task = asyncio.create_task(background_discovery())
 
+    return _with_topology({
+        "status": "discovery_started",
+        "message": "Discovery started in background. UI will update automatically."
+    }, current_topology)
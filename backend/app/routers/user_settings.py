@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, selectinload
 from typing import Dict, Any, List
 from pydantic import BaseModel
 
 from ..db import get_db
 from ..services.user_settings import user_settings_service
+from ..services.topology_cache import topology_cache
 
 
 router = APIRouter()
@@ -139,10 +141,18 @@ def delete_mapping(identifier: str, device_type: str, db: Session = Depends(get_
 def apply_mappings_to_devices(db: Session = Depends(get_db)):
     """Apply user mappings to all existing devices in the database"""
     try:
-        from ..models import Device
+        from ..models import Device, Interface, UserSettings
         
-        devices = db.query(Device).all()
-        updated_count = 0
+        # Only devices whose IP or some interface MAC has a mapping can change
+        mac_ids = select(UserSettings.id).where(UserSettings.device_type == "mac_mapping")
+        ip_ids = select(UserSettings.id).where(UserSettings.device_type == "ip_mapping")
+        # Interfaces are only read for their MAC; fetch them for all candidates in one query
+        devices = db.scalars(
+            select(Device)
+            .where(or_(Device.mgmt_ip.in_(ip_ids), Device.interfaces.any(Interface.mac.in_(mac_ids))))
+            .options(selectinload(Device.interfaces).load_only(Interface.mac))
+        ).all()
+        updates = []
         
         for device in devices:
             # Get device data as dict
@@ -169,12 +179,19 @@ def apply_mappings_to_devices(db: Session = Depends(get_db)):
                 updated_data["model"] != device.model or 
                 updated_data["hostname"] != device.hostname):
                 
-                device.vendor = updated_data["vendor"]
-                device.model = updated_data["model"]
-                device.hostname = updated_data["hostname"]
-                updated_count += 1
+                updates.append({
+                    "id": device.id,
+                    "vendor": updated_data["vendor"],
+                    "model": updated_data["model"],
+                    "hostname": updated_data["hostname"]
+                })
         
+        # One executemany UPDATE instead of a flush per dirty instance
+        if updates:
+            db.bulk_update_mappings(Device, updates)
         db.commit()
+        updated_count = len(updates)
+        topology_cache.invalidate()
         
         return {
             "status": "success", 
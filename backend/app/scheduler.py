@@ -1,35 +1,57 @@
+import logging
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .db import SessionLocal
-from .services.snmp import SnmpClient
-from .services.discovery import DiscoveryService
-from .services.fast_discovery import FastDiscoveryService
+from .services.discovery import get_discovery_service
 from .services.polling import PollingService
 from .models import Device
-from .config import settings
+
+logger = logging.getLogger(__name__)
 
 _scheduler = None
 
+# Discovery runs every 30s while devices change and backs off to 5 min when idle
+DISCOVERY_BASE_INTERVAL_SEC = 30
+DISCOVERY_MAX_INTERVAL_SEC = 300
+
+
+def next_discovery_interval(current: int, changed: bool) -> int:
+    """Reset to the base interval on change, otherwise double up to the max"""
+    if changed:
+        return DISCOVERY_BASE_INTERVAL_SEC
+    return min(current * 2, DISCOVERY_MAX_INTERVAL_SEC)
+
 
 def start_scheduler():
     global _scheduler
     if _scheduler is None:
         _scheduler = AsyncIOScheduler()
         # Re-enable discovery job with fast discovery (no SNMP)
-        snmp_client = SnmpClient(config=settings.snmp_config)
-        fast_discovery = FastDiscoveryService(config=settings.snmp_config)
-        discovery = DiscoveryService(snmp_client, fast_discovery)
+        discovery = get_discovery_service()
+
+        state = {"fingerprint": None, "interval": DISCOVERY_BASE_INTERVAL_SEC}
 
         async def job():
             db: Session = SessionLocal()
             try:
                 await discovery.run_discovery(db)
+                fingerprint = frozenset(db.execute(select(Device.id, Device.mgmt_ip)).all())
             finally:
                 db.close()
 
-        # Run discovery every 30 seconds to catch network changes quickly
-        _scheduler.add_job(job, "interval", seconds=30, id="discovery_job")
-        print("🚀 Scheduler started with fast discovery every 30 seconds")
+            changed = fingerprint != state["fingerprint"]
+            state["fingerprint"] = fingerprint
+            interval = next_discovery_interval(state["interval"], changed)
+            if interval != state["interval"]:
+                state["interval"] = interval
+                _scheduler.reschedule_job("discovery_job", trigger="interval", seconds=interval)
+                logger.info("Discovery interval set to %d seconds", interval)
+
+        # Start at 30 seconds to catch network changes quickly
+        _scheduler.add_job(job, "interval", seconds=DISCOVERY_BASE_INTERVAL_SEC, id="discovery_job")
+        logger.info("Scheduler started with fast discovery every %d seconds (adaptive)", DISCOVERY_BASE_INTERVAL_SEC)
         _scheduler.start()
 
 
@@ -1,94 +1,197 @@
+import atexit
+import logging
+import os
+import threading
 import time
-import json
+import orjson
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 
 class DeviceCache:
-    def __init__(self, cache_duration_minutes: int = 5):
+    def __init__(self, cache_duration_minutes: int = 5, max_entries: int = 10000,
+                 cache_file: str = "device_cache.json"):
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
-        self.devices_cache: Dict[str, Any] = {}
+        self.max_entries = max_entries
+        # Least recently used first; each entry expires on its own timestamp
+        self.devices_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cached_at: Dict[str, datetime] = {}
         self.last_update: Optional[datetime] = None
-        self.cache_file = "device_cache.json"
+        # Bumped on every change to the cached entries, so callers can tell a stale copy
+        self.version = 0
+        # Resolved now, so later writes from the writer thread don't follow the working directory
+        self.cache_file = os.path.abspath(cache_file)
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closed = threading.Event()
+        self._write_lock = threading.Lock()
         
         # Load cache from file on initialization
         self._load_from_file()
         
+        # Write-behind: mutations only mark the cache dirty, a daemon thread persists it
+        self._writer = threading.Thread(target=self._write_loop, name="device-cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+        
+    def _put(self, device_id: str, device: Dict[str, Any], now: datetime) -> None:
+        """Insert or refresh one entry, evicting the least recently used past max_entries"""
+        self.devices_cache[device_id] = device
+        self.devices_cache.move_to_end(device_id)
+        self._cached_at[device_id] = now
+        self.version += 1
+        while len(self.devices_cache) > self.max_entries:
+            evicted_id, _ = self.devices_cache.popitem(last=False)
+            self._cached_at.pop(evicted_id, None)
+    
+    def _purge_expired(self, now: datetime) -> None:
+        """Drop entries older than cache_duration"""
+        cutoff = now - self.cache_duration
+        for device_id in [i for i, cached_at in self._cached_at.items() if cached_at <= cutoff]:
+            self.devices_cache.pop(device_id, None)
+            del self._cached_at[device_id]
+            self.version += 1
+    
     def is_cache_valid(self) -> bool:
-        """Check if the cache is still valid"""
-        if not self.last_update:
-            return False
-        return datetime.now() - self.last_update < self.cache_duration
+        """Check if any cached entry is still fresh"""
+        with self._lock:
+            self._purge_expired(datetime.now())
+            return bool(self.devices_cache)
     
     def get_cached_devices(self) -> List[Dict[str, Any]]:
-        """Get devices from cache if valid"""
-        if self.is_cache_valid():
+        """Get devices whose cache entries have not expired"""
+        with self._lock:
+            self._purge_expired(datetime.now())
             return list(self.devices_cache.values())
-        return []
     
     def update_cache(self, devices: List[Dict[str, Any]]) -> None:
         """Update the device cache"""
-        # Convert list to dict for faster lookups
-        self.devices_cache = {device.get('id', device.get('mgmtIp', '')): device for device in devices}
-        self.last_update = datetime.now()
+        now = datetime.now()
+        with self._lock:
+            self.devices_cache = OrderedDict()
+            self._cached_at = {}
+            self.version += 1
+            for device in devices:
+                self._put(device.get('id', device.get('mgmtIp', '')), device, now)
+            self.last_update = now
         
         # Save to file for persistence
-        self._save_to_file()
+        self._dirty.set()
     
     def get_device(self, device_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific device from cache"""
-        return self.devices_cache.get(device_id)
+        with self._lock:
+            cached_at = self._cached_at.get(device_id)
+            if cached_at is None:
+                return None
+            if datetime.now() - cached_at >= self.cache_duration:
+                self.devices_cache.pop(device_id, None)
+                del self._cached_at[device_id]
+                self.version += 1
+                return None
+            self.devices_cache.move_to_end(device_id)
+            return self.devices_cache[device_id]
     
     def update_device(self, device: Dict[str, Any]) -> None:
         """Update a single device in cache"""
         device_id = device.get('id', device.get('mgmtIp', ''))
         if device_id:
-            self.devices_cache[device_id] = device
-            self.last_update = datetime.now()
-            self._save_to_file()
+            now = datetime.now()
+            with self._lock:
+                self._put(device_id, device, now)
+                self.last_update = now
+            self._dirty.set()
     
     def remove_device(self, device_id: str) -> None:
         """Remove a device from cache"""
-        if device_id in self.devices_cache:
+        with self._lock:
+            if device_id not in self.devices_cache:
+                return
             del self.devices_cache[device_id]
+            self._cached_at.pop(device_id, None)
+            self.version += 1
             self.last_update = datetime.now()
-            self._save_to_file()
+        self._dirty.set()
+    
+    def flush(self) -> None:
+        """Persist pending changes immediately"""
+        with self._write_lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self._save_to_file()
+    
+    def close(self) -> None:
+        """Persist pending changes and stop the background writer"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        # Wake the writer so it sees _closed; keep the dirty flag as it was for the final flush
+        dirty = self._dirty.is_set()
+        self._dirty.set()
+        self._writer.join()
+        if not dirty:
+            self._dirty.clear()
+        self.flush()
+        atexit.unregister(self.flush)
+    
+    def _write_loop(self) -> None:
+        """Background writer; changes made between wakeups collapse into one write"""
+        while True:
+            self._dirty.wait()
+            if self._closed.is_set():
+                return
+            self.flush()
     
     def _save_to_file(self) -> None:
         """Save cache to file for persistence"""
         try:
-            cache_data = {
-                'devices': list(self.devices_cache.values()),
-                'last_update': self.last_update.isoformat() if self.last_update else None
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            with self._lock:
+                cache_data = {
+                    'devices': list(self.devices_cache.values()),
+                    'cached_at': {i: t.isoformat() for i, t in self._cached_at.items()},
+                    'last_update': self.last_update.isoformat() if self.last_update else None
+                }
+            # Write to a temp file and swap it in so readers never see a partial cache
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(cache_data, option=orjson.OPT_NON_STR_KEYS))
+            os.replace(tmp_file, self.cache_file)
         except Exception as e:
-            print(f"Failed to save cache to file: {e}")
+            logger.warning("Failed to save cache to file: %s", e)
     
     def _load_from_file(self) -> None:
         """Load cache from file"""
         try:
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
-            
-            devices = cache_data.get('devices', [])
-            self.devices_cache = {device.get('id', device.get('mgmtIp', '')): device for device in devices}
+            with open(self.cache_file, 'rb') as f:
+                cache_data = orjson.loads(f.read())
             
             last_update_str = cache_data.get('last_update')
             if last_update_str:
                 self.last_update = datetime.fromisoformat(last_update_str)
+            
+            # Older files only carry last_update; use it for every entry
+            cached_at = cache_data.get('cached_at') or {}
+            fallback = self.last_update or datetime.now()
+            for device in cache_data.get('devices', []):
+                device_id = device.get('id', device.get('mgmtIp', ''))
+                stamp = cached_at.get(device_id)
+                self._put(device_id, device, datetime.fromisoformat(stamp) if stamp else fallback)
+            self._purge_expired(datetime.now())
                 
         except FileNotFoundError:
             # Cache file doesn't exist yet, that's fine
             pass
         except Exception as e:
-            print(f"Failed to load cache from file: {e}")
+            logger.warning("Failed to load cache from file: %s", e)
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         return {
             'device_count': len(self.devices_cache),
+            'max_entries': self.max_entries,
             'last_update': self.last_update.isoformat() if self.last_update else None,
             'is_valid': self.is_cache_valid(),
             'cache_duration_minutes': self.cache_duration.total_seconds() / 60
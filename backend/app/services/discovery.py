@@ -1,12 +1,20 @@
+import logging
+from functools import lru_cache
 from typing import Any, Dict, List
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
+from ..config import SNMP_CONFIG
 from ..models import Device, Interface, Edge
 from .snmp import SnmpClient
 from .fast_discovery import FastDiscoveryService
 from .topology_builder import build_topology
+from .topology_cache import topology_cache
 from .user_settings import user_settings_service
 
+logger = logging.getLogger(__name__)
+
 
 class DiscoveryService:
     def __init__(self, snmp_client: SnmpClient, fast_discovery: FastDiscoveryService):
@@ -19,9 +27,9 @@ class DiscoveryService:
 
         # If no devices found, don't clear existing ones (network might be temporarily down)
         if not devices:
-            print("No devices found, keeping existing devices in database")
+            logger.info("No devices found, keeping existing devices in database")
             # Return existing topology
-            existing_devices = db.query(Device).all()
+            existing_devices = db.execute(select(Device.id, Device.hostname, Device.mgmt_ip, Device.vendor))
             return {
                 "nodes": [
                     {
@@ -37,42 +45,53 @@ class DiscoveryService:
 
         # Get current device IPs to detect network changes
         current_ips = {d.get("mgmtIp") for d in devices if d.get("mgmtIp")}
-        existing_devices = db.query(Device).all()
-        existing_ips = {d.mgmt_ip for d in existing_devices}
+        existing_ips = set(db.scalars(select(Device.mgmt_ip)))
         
         # Check if we're on a different network (no overlap in IPs)
         if existing_ips and not current_ips.intersection(existing_ips):
-            print(f"🔄 Network change detected! Old IPs: {existing_ips}, New IPs: {current_ips}")
-            print("Clearing old devices and discovering new network...")
+            logger.info("Network change detected, clearing old devices")
+            logger.debug("Old IPs: %s, new IPs: %s", existing_ips, current_ips)
             # Clear old devices since we're on a different network
             db.query(Edge).delete()
             db.query(Interface).delete()
             db.query(Device).delete()
             db.commit()
+            topology_cache.invalidate()
 
-        # Upsert devices
-        device_map = {}
+        # Upsert devices with a single INSERT ... ON CONFLICT DO UPDATE
+        device_rows = {}
         for d in devices:
             device_id = d.get("id") or d.get("mgmtIp")
             if not device_id:
                 continue
-            device = db.query(Device).filter(Device.id == device_id).first()
-            if not device:
-                device = Device(id=device_id)
-            device.hostname = d.get("hostname")
-            device.mgmt_ip = d.get("mgmtIp")
-            device.vendor = d.get("vendor")
-            device.model = d.get("model")
-            device.status = d.get("status", "up")
-            device.connection_type = d.get("connection_type", "Unknown")
-            device.ip_version = d.get("ip_version", "IPv4")
-            device.device_name = d.get("device_name")
-            db.add(device)
-            device_map[device_id] = device
+            device_rows[device_id] = {
+                "id": device_id,
+                "hostname": d.get("hostname"),
+                "mgmt_ip": d.get("mgmtIp"),
+                "vendor": d.get("vendor"),
+                "model": d.get("model"),
+                "status": d.get("status", "up"),
+                "connection_type": d.get("connection_type", "Unknown"),
+                "ip_version": d.get("ip_version", "IPv4"),
+                "device_name": d.get("device_name"),
+            }
+        if device_rows:
+            stmt = insert(Device).values(list(device_rows.values()))
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[Device.id],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("hostname", "mgmt_ip", "vendor", "model", "status",
+                                   "connection_type", "ip_version", "device_name")
+                },
+            ))
 
         # Upsert interfaces if provided, or create default interface with MAC
+        iface_rows = {}
         for d in devices:
             device_id = d.get("id") or d.get("mgmtIp")
+            if not device_id:
+                continue
             ifaces = d.get("interfaces", [])
             
             # If no interfaces provided, create a default one with the MAC address
@@ -87,39 +106,55 @@ class DiscoveryService:
             
             for i in ifaces:
                 iface_id = f"{device_id}:{i.get('ifIndex')}"
-                iface = db.query(Interface).filter(Interface.id == iface_id).first()
-                if not iface:
-                    iface = Interface(id=iface_id, device_id=device_id, if_index=i.get("ifIndex"))
-                iface.name = i.get("name")
-                iface.speed = i.get("speed")
-                iface.mac = i.get("mac")
-                iface.admin_status = i.get("adminStatus")
-                iface.oper_status = i.get("operStatus")
-                db.add(iface)
+                iface_rows[iface_id] = {
+                    "id": iface_id,
+                    "device_id": device_id,
+                    "if_index": i.get("ifIndex"),
+                    "name": i.get("name"),
+                    "speed": i.get("speed"),
+                    "mac": i.get("mac"),
+                    "admin_status": i.get("adminStatus"),
+                    "oper_status": i.get("operStatus"),
+                }
+        if iface_rows:
+            stmt = insert(Interface).values(list(iface_rows.values()))
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[Interface.id],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("name", "speed", "mac", "admin_status", "oper_status")
+                },
+            ))
 
         # Skip SNMP operations for now to avoid blocking
         # TODO: Implement async SNMP operations in separate threads
-        print("🚀 Fast discovery mode: Skipping SNMP operations to avoid blocking")
+        logger.debug("Fast discovery mode: skipping SNMP operations to avoid blocking")
         
         # Build topology from discovered data only (no SNMP neighbors)
         topo = build_topology(devices=devices, forwarding_tables=[], neighbors=[])
 
         # Replace edges table
         db.query(Edge).delete()
-        for e in topo.get("edges", []):
-            edge = Edge(
-                id=e.get("id"),
-                src_device_id=e.get("from"),
-                src_if_index=e.get("srcIfIndex") or 0,
-                dst_device_id=e.get("to"),
-                dst_if_index=e.get("dstIfIndex") or 0,
-                link_type=e.get("linkType") or "unknown",
-                vlan_tags=e.get("vlanTags") or [],
-                confidence=e.get("confidence") or 100,
-            )
-            db.add(edge)
+        db.bulk_insert_mappings(Edge, [
+            {
+                "id": e.get("id"),
+                "src_device_id": e.get("from"),
+                "src_if_index": e.get("srcIfIndex") or 0,
+                "dst_device_id": e.get("to"),
+                "dst_if_index": e.get("dstIfIndex") or 0,
+                "link_type": e.get("linkType") or "unknown",
+                "vlan_tags": e.get("vlanTags") or [],
+                "confidence": e.get("confidence") or 100,
+            }
+            for e in topo.get("edges", [])
+        ])
 
         db.commit()
+        topology_cache.invalidate()
         return topo
 
 
+@lru_cache(maxsize=1)
+def get_discovery_service() -> DiscoveryService:
+    """Shared discovery stack for the API and the scheduler, built on first use"""
+    return DiscoveryService(SnmpClient(config=SNMP_CONFIG), FastDiscoveryService(config=SNMP_CONFIG))
@@ -1,26 +1,429 @@
+import ipaddress
+import itertools
+import selectors
+import struct
 import subprocess
 import socket
 import re
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Coroutine, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 import platform
 import asyncio
-import concurrent.futures
+import errno
+import logging
 import threading
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import httpx
 import time
 from .oui_database import oui_db
 from .user_settings import user_settings_service
 from .router_discovery import RouterDiscoveryService
 from .device_cache import device_cache
+from .snmp import snmp_get
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
+# Optional psutil import
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# Optional uvloop import
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Optional scapy import
+try:
+    from scapy.all import ARP, Ether, srp
+    HAS_SCAPY = True
+except ImportError:
+    HAS_SCAPY = False
+
+# "inet 192.168.1.5/24" (ip -o addr) or "inet 192.168.1.5 netmask 0xffffff00" (ifconfig)
+_INET_RE = re.compile(r'inet (\d+\.\d+\.\d+\.\d+)(?:/(\d+)|.*?netmask (\S+))')
+
+# ARP output parsing: "? (192.168.1.1) at 28:80:88:34:f1:79 on en0 ifscope [ethernet]"
+# One match per line yields hostname, IP and MAC; broadcast/multicast entries are rejected up front
+_ARP_ENTRY_RE = re.compile(
+    r'^(?!.*(?:broadcast|mcast))(?P<host>[^(]*)\((?P<ip>[0-9.]+)\) at (?P<mac>[0-9a-fA-F:]+)',
+    re.IGNORECASE
+)
+_SKIP_IP_PREFIXES = ('224.', '239.', '255.255.255.255')
+_EMPTY_HOSTS = frozenset({'?', ''})
+_ARP_MAC_AT_RE = re.compile(r'at\s+([0-9a-fA-F:]+)')
+_MAC_RE = re.compile(r'([0-9a-fA-F:]{17})')
+
+# Kernel neighbour table on Linux; the same data `arp -a` prints, without a fork
+_PROC_NET_ARP = '/proc/net/arp'
+_ATF_COM = 0x2  # entry is complete
+
+# Banner grabbing: SSH and telnet speak first, plain HTTP needs a request to answer.
+# TCP_USER_TIMEOUT is Linux-only
+_BANNER_PORTS = (22, 23, 80, 443, 8080, 8443, 161, 162)
+_BANNER_PROBES = {80: b'GET / HTTP/1.0\r\n\r\n', 8080: b'GET / HTTP/1.0\r\n\r\n'}
+_TCP_USER_TIMEOUT = getattr(socket, 'TCP_USER_TIMEOUT', None)
+
+# Connectivity check: (test name, host) DNS lookups and (test name, host, port) TCP probes
+_CONNECTIVITY_LOOKUPS = (("DNS Resolution", 'google.com'), ("DNS Resolution 2", 'cloudflare.com'))
+_CONNECTIVITY_PROBES = (
+    ("Internet Access", '8.8.8.8', 53),  # Google DNS
+    ("External Service", '1.1.1.1', 53),  # Cloudflare DNS
+    ("HTTP Service", 'httpbin.org', 80),  # HTTP service
+)
+_CONNECTIVITY_LOOKUP_HOSTS = [host for _, host in _CONNECTIVITY_LOOKUPS]
+_CONNECTIVITY_PROBE_TARGETS = [(host, port) for _, host, port in _CONNECTIVITY_PROBES]
+
+# Linux interface address ioctls, used when psutil is missing
+_SIOCGIFADDR = 0x8915
+_SIOCGIFNETMASK = 0x891b
+
+def _ordered_re(patterns: List[str]) -> "re.Pattern[str]":
+    """Fuse patterns into one, matched at the start, where the first pattern found anywhere wins"""
+    # Each alternative is a lookahead over the whole text, tried in list order; a plain
+    # alternation would pick whichever match starts leftmost instead
+    return re.compile('|'.join(f'(?=.*?{p})' for p in patterns), re.IGNORECASE | re.DOTALL)
+
+
+# Model extraction from SNMP sysDescr, HTML pages, UPnP replies and service banners
+_SYSDESCR_MODEL_RE = _ordered_re([
+    r'(\w+)\s+Router',  # "Orbi Router"
+    r'(\w+)\s+Switch',  # "Cisco Switch"
+    r'(\w+)\s+AP',      # "Unifi AP"
+    r'Model:\s*(\w+)',  # "Model: B0210"
+    r'(\w+)\s+\d+',     # "Netgear R7000"
+])
+_HTML_TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+_TITLE_MODEL_RE = re.compile(r'(\w+)\s+(Router|Switch|AP|Device)', re.IGNORECASE)
+_HTML_MODEL_RE = _ordered_re([
+    r'Model[:\s]+(\w+)',
+    r'Device[:\s]+(\w+)',
+    r'Product[:\s]+(\w+)',
+])
+_UPNP_MODEL_RE = re.compile(r'MODEL[:\s]+([^\r\n]+)', re.IGNORECASE)
+_SERVER_HEADER_RE = re.compile(r'Server[:\s]+([^\r\n]+)', re.IGNORECASE)
+
+# Vendor substrings -> connection type, checked in order; unmatched vendors are assumed
+# dual-band wireless. One capturing group per rule, so lastindex - 1 is the rule hit
+_CONNECTION_TYPE_RULES = [
+    ('apple|samsung|google|microsoft|amazon|sony|lg|huawei|xiaomi|oneplus|motorola|nokia',
+     "Wireless (2.4GHz/5GHz)"),
+    ('netgear|cisco|linksys|tp-link|d-link|asus', "Wired (Ethernet)"),
+    ('espressif|dyson|philips|nest|ring|arlo', "Wireless (2.4GHz)"),
+]
+_CONNECTION_TYPE_RE = _ordered_re([f'({keywords})' for keywords, _ in _CONNECTION_TYPE_RULES])
+# Vendors whose name-derived device label says "Router" rather than "Device"
+_ROUTER_NAME_VENDORS = frozenset({'netgear', 'cisco', 'linksys'})
+
+# One multicast M-SEARCH per discovery pass; every UPnP device on the LAN answers it
+_SSDP_ADDR = ('239.255.255.250', 1900)
+_SSDP_BYTES = (
+    "M-SEARCH * HTTP/1.1\r\n"
+    "HOST: 239.255.255.250:1900\r\n"
+    "MAN: \"ssdp:discover\"\r\n"
+    "ST: upnp:rootdevice\r\n"
+    "MX: 3\r\n\r\n"
+).encode()
+
+# Hostname keywords -> (type, vendor), checked in order; the first matching rule wins
+_DEVICE_TYPE_RULES = [
+    (r'router|gateway|ap|access-point', 'router', 'Router'),
+    (r'switch|sw', 'switch', 'Switch'),
+    (r'printer|print', 'printer', 'Printer'),
+    (r'nas|storage|server', 'server', 'Server'),
+    (r'iphone|ipad|android|phone', 'mobile', 'Mobile'),
+    (r'laptop|desktop|pc|mac', 'computer', 'Computer'),
+]
+# All rules in one pattern: alternatives are tried in rule order, each as a lookahead over
+# the whole hostname, and the matching rule's empty named group reports which one hit
+_DEVICE_TYPE_RE = re.compile('|'.join(
+    f'(?=.*?(?:{keywords}))(?P<{device_type}>)' for keywords, device_type, _ in _DEVICE_TYPE_RULES
+))
+_DEVICE_TYPE_VENDORS = {device_type: vendor for _, device_type, vendor in _DEVICE_TYPE_RULES}
+
+
+def classify_hostname(hostname_lower: str) -> Tuple[str, str]:
+    """(type, vendor) implied by hostname keywords; ('device', 'Unknown') when none match"""
+    match = _DEVICE_TYPE_RE.match(hostname_lower)
+    if match is None:
+        return 'device', 'Unknown'
+    return match.lastgroup, _DEVICE_TYPE_VENDORS[match.lastgroup]
+
+
+@dataclass(slots=True)
+class NeighborEntry:
+    """A host seen in the ARP table ('arp') or answering the network sweep ('scan')"""
+    ip: str
+    mac: str
+    hostname: str
+    type: str
+    # ARP and the sweep are IPv4-only; IPv6 neighbours would come from NDP
+    ip_version: str = "IPv4"
+
+
+# A LAN has a handful of vendors, so the vendor-derived labels below are memoized per vendor
+@lru_cache(maxsize=1024)
+def _vendor_connection_type(vendor: Optional[str]) -> str:
+    """Connection type implied by vendor substrings; dual-band wireless when none match"""
+    # Wireless phone/PC vendors, then router vendors, then IoT vendors; most modern
+    # devices support 5GHz, but we can't determine exact frequency from ARP
+    match = _CONNECTION_TYPE_RE.match(vendor) if vendor else None
+    if match is None:
+        return "Wireless (2.4GHz/5GHz)"
+    return _CONNECTION_TYPE_RULES[match.lastindex - 1][1]
+
+
+@lru_cache(maxsize=1024)
+def _vendor_device_name(vendor: str) -> str:
+    """Device label from the vendor's first word: "Netgear Router", "Apple Device", ..."""
+    vendor_clean = vendor.split()[0]
+    if vendor_clean.lower() in _ROUTER_NAME_VENDORS:
+        return f"{vendor_clean} Router"
+    return f"{vendor_clean} Device"
+
+
+def _stream_lines(cmd: List[str], timeout: float) -> Iterator[str]:
+    """Yield a command's stdout line by line as it is produced; kill it after timeout"""
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        yield from proc.stdout
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
+T = TypeVar('T')
+
+
+def _run_coro(coro: Coroutine[Any, Any, T]) -> T:
+    """asyncio.run for worker threads, on a uvloop loop when uvloop is installed"""
+    if not HAS_UVLOOP:
+        return asyncio.run(coro)
+    loop = uvloop.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _icmp_sweep(ips: List[str], timeout: float = 1.5) -> Set[str]:
+    """Echo every ip from one ICMP socket and return the ones that replied"""
+    try:
+        # Unprivileged ping socket; the kernel owns the ident and filters replies for us
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        raw = False
+    except PermissionError:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        raw = True
+    ident = os.getpid() & 0xffff
+    # The sequence number identifies the target, so replies demux with one dict lookup
+    pending = {seq: ip for seq, ip in enumerate(ips, 1)}
+    alive = set()
+    with sock, selectors.DefaultSelector() as sel:
+        sock.setblocking(False)
+        deadline = time.monotonic() + timeout
+        for seq, ip in list(pending.items()):
+            header = struct.pack('!BBHHH', 8, 0, 0, ident, seq)
+            packet = struct.pack('!BBHHH', 8, 0, _icmp_checksum(header), ident, seq)
+            while True:
+                try:
+                    sock.sendto(packet, (ip, 0))
+                    break
+                except OSError as e:
+                    if not isinstance(e, BlockingIOError) and e.errno != errno.ENOBUFS:
+                        logger.debug("ICMP echo to %s failed: %s", ip, e)
+                        del pending[seq]
+                        break
+                    no_bufs = e.errno == errno.ENOBUFS
+                # Send buffer full: wait until the socket drains, then send the same echo again
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sel.register(sock, selectors.EVENT_WRITE)
+                sel.select(remaining)
+                sel.unregister(sock)
+                if no_bufs:
+                    # Datagram sockets stay writable through ENOBUFS, so back off briefly
+                    time.sleep(0.001)
+        sel.register(sock, selectors.EVENT_READ)
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(remaining):
+                break
+            while True:
+                try:
+                    data, (src, _) = sock.recvfrom(1024)
+                except BlockingIOError:
+                    break
+                # Raw sockets (and macOS ping sockets) deliver the IP header too
+                if data and data[0] >> 4 == 4:
+                    data = data[(data[0] & 0x0f) * 4:]
+                if len(data) < 8:
+                    continue
+                icmp_type, _, _, reply_ident, seq = struct.unpack_from('!BBHHH', data)
+                if icmp_type != 0 or (raw and reply_ident != ident):
+                    continue
+                if pending.get(seq) == src:
+                    alive.add(pending.pop(seq))
+    return alive
+
+
+def _read_tcp_banners(ip: str, ports: Iterable[int], timeout: float) -> Dict[int, bytes]:
+    """Connect to every port at once and read each open one's banner on the same connection.
+
+    Open ports that send nothing before the deadline map to b''; closed ones are absent.
+    """
+    banners: Dict[int, bytes] = {}
+    with selectors.DefaultSelector() as sel:
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            if _TCP_USER_TIMEOUT is not None:
+                # Abort on a peer that stops acknowledging instead of retransmitting for minutes
+                sock.setsockopt(socket.IPPROTO_TCP, _TCP_USER_TIMEOUT, int(timeout * 1000))
+            err = sock.connect_ex((ip, port))
+            if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                sel.register(sock, selectors.EVENT_WRITE, port)
+            else:
+                sock.close()
+        deadline = time.monotonic() + timeout
+        try:
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, events in sel.select(remaining):
+                    sock, port = key.fileobj, key.data
+                    if events & selectors.EVENT_WRITE:
+                        # Writable means the connect finished; SO_ERROR says how
+                        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                            sel.unregister(sock)
+                            sock.close()
+                            continue
+                        banners[port] = b''
+                        probe = _BANNER_PROBES.get(port)
+                        try:
+                            sock.send(probe or b'')
+                        except OSError:
+                            sel.unregister(sock)
+                            sock.close()
+                            continue
+                        sel.modify(sock, selectors.EVENT_READ, port)
+                    else:
+                        try:
+                            banners[port] = sock.recv(1024)
+                        except OSError:
+                            pass
+                        sel.unregister(sock)
+                        sock.close()
+        finally:
+            for key in list(sel.get_map().values()):
+                sel.unregister(key.fileobj)
+                key.fileobj.close()
+    return banners
+
+
+def _ioctl_ipv4_interfaces() -> List[ipaddress.IPv4Interface]:
+    """Primary IPv4 address and netmask of each Linux interface, read with ioctl"""
+    import fcntl
+    interfaces = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for _, name in socket.if_nameindex():
+            ifreq = struct.pack('256s', name.encode()[:15])
+            try:
+                addr = fcntl.ioctl(sock.fileno(), _SIOCGIFADDR, ifreq)[20:24]
+                mask = fcntl.ioctl(sock.fileno(), _SIOCGIFNETMASK, ifreq)[20:24]
+            except OSError:
+                # Interface is down or has no IPv4 address
+                continue
+            interfaces.append(ipaddress.IPv4Interface((socket.inet_ntoa(addr), socket.inet_ntoa(mask))))
+    return interfaces
+
+
+def _host_ips(network: ipaddress.IPv4Network) -> List[str]:
+    """Dotted-quad host addresses of network, without an IPv4Address object per host"""
+    if network.prefixlen >= 31:
+        # /31 and /32 have no network/broadcast addresses to skip
+        return [str(host) for host in network.hosts()]
+    first = int(network.network_address) + 1
+    last = int(network.broadcast_address)
+    return [socket.inet_ntoa(n.to_bytes(4, 'big')) for n in range(first, last)]
+
 
 class FastDiscoveryService:
+    # Reuse a connectivity result for this long instead of re-running every probe
+    CONNECTIVITY_TTL_SEC = 15
+    # Successful external name resolution is trusted for this long
+    DNS_OK_TTL_SEC = 30
+    # Upper bound on the per-device SNMP/HTTP/UPnP/service probes
+    DEVICE_PROBE_TIMEOUT_SEC = 2.0
+    # Reverse-DNS answers, including "no PTR record", are reused for this long
+    RDNS_TTL_SEC = 300
+    # ARP table reads this close together share one result
+    ARP_TABLE_TTL_SEC = 5
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        # Caps the devices enriched at once so a large LAN doesn't flood a small router
+        self._probe_concurrency = max(1, int(config.get('discovery_concurrency', 64)))
         self.network_status = {"connected": True, "last_check": None, "error": None}
+        # Monotonic time of the last full check; last_check stays wall-clock for API clients
+        self._connectivity_checked_at: Optional[float] = None
+        self._dns_ok_until = 0.0
+        # ip -> (monotonic time resolved, PTR name or None)
+        self._rdns_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+        # (monotonic time read, entries) of the last ARP table read
+        self._arp_table: Optional[Tuple[float, List[NeighborEntry]]] = None
+        # Devices from this service's last discovery, served without consulting device_cache
+        # until they would expire there or device_cache changes (tracked by its version)
+        self._cache_hot: Optional[List[Dict[str, Any]]] = None
+        self._cache_hot_expires = 0.0
+        self._cache_hot_version = -1
+        # Platform dispatch resolved once; both macOS and Linux list neighbours with `arp -a`
+        system = platform.system()
+        self._arp_cmd: Optional[List[str]] = ['arp', '-a'] if system in ("Darwin", "Linux") else None
+        self._use_proc_arp = system == "Linux" and os.path.exists(_PROC_NET_ARP)
+        self._arp_mac_re = _ARP_MAC_AT_RE if system == "Darwin" else _MAC_RE if system == "Linux" else None
+        # ping -W is milliseconds on macOS and seconds on Linux
+        self._ping_argv = ['ping', '-c', '1', '-W', '1000' if system == "Darwin" else '1']
+        self._ifaddr_cmd = ['ifconfig'] if system == "Darwin" else ['ip', '-o', '-4', 'addr']
+        self._ifaddr_ioctl = system == "Linux"
+        # Reused so its HTTP session keeps connections to the router alive
+        self._router_service: Optional[RouterDiscoveryService] = None
+        # Pooled client for HTTP model probes, bound to the loop it was created on
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Blocking probes (UPnP, banners, sweeps, ARP reads) share warm threads across passes
+        self._probe_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="probe")
+        
+    def close(self) -> None:
+        """Stop the probe threads, dropping probes that have not started"""
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
         
     def _get_vendor_from_mac(self, mac: str) -> str:
         """Get vendor name from MAC address using OUI database"""
@@ -31,184 +434,275 @@ class FastDiscoveryService:
         vendor = oui_db.lookup_vendor(mac)
         return vendor if vendor else "Unknown"
     
+    def _get_vendors_bulk(self, macs: Iterable[str]) -> Dict[str, str]:
+        """_get_vendor_from_mac for a whole table in one OUI database call"""
+        vendors = oui_db.lookup_vendors(mac for mac in macs if mac and len(mac) >= 8)
+        return {mac: vendor or "Unknown" for mac, vendor in vendors.items()}
+    
+    def _classify(self, mac: Optional[str], hostname_lower: str) -> Tuple[str, str]:
+        """Vendor and device type: the MAC's OUI vendor when known, else hostname keywords"""
+        device_type, vendor = classify_hostname(hostname_lower)
+        oui_vendor = self._get_vendor_from_mac(mac)
+        return (oui_vendor if oui_vendor != "Unknown" else vendor), device_type
+    
     def _get_mac_from_arp(self, ip: str) -> str:
         """Get MAC address for an IP from ARP table"""
+        if self._use_proc_arp:
+            return self._get_arp_map().get(ip)
         try:
-            if platform.system() == "Darwin":  # macOS
+            if self._arp_mac_re is not None:
+                # macOS: "? (192.168.1.11) at 6a:6:44:26:70:e3 on en0 ifscope [ethernet]"
                 result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True, timeout=5)
                 if result.returncode == 0:
-                    # Parse output: "? (192.168.1.11) at 6a:6:44:26:70:e3 on en0 ifscope [ethernet]"
-                    match = re.search(r'at\s+([0-9a-fA-F:]+)', result.stdout)
-                    if match:
-                        return match.group(1)
-            elif platform.system() == "Linux":
-                result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    # Parse Linux ARP output
-                    match = re.search(r'([0-9a-fA-F:]{17})', result.stdout)
+                    match = self._arp_mac_re.search(result.stdout)
                     if match:
                         return match.group(1)
         except Exception as e:
-            print(f"Error getting MAC for {ip}: {e}")
+            logger.debug("Error getting MAC for %s: %s", ip, e)
         return None
     
-    def _scan_network_async(self) -> List[Dict[str, str]]:
-        """Scan the network to find devices not in ARP table (threaded)"""
-        import concurrent.futures
-        import threading
-        
+    def _local_ipv4_interfaces(self) -> List[ipaddress.IPv4Interface]:
+        """Non-loopback IPv4 addresses of this host, with their networks"""
+        interfaces = []
+        try:
+            if HAS_PSUTIL:
+                for addrs in psutil.net_if_addrs().values():
+                    for a in addrs:
+                        if a.family == socket.AF_INET and a.netmask and not a.address.startswith('127.'):
+                            interfaces.append(ipaddress.IPv4Interface((a.address, a.netmask)))
+                return interfaces
+            if self._ifaddr_ioctl:
+                return [i for i in _ioctl_ipv4_interfaces() if not i.ip.is_loopback]
+            
+            for line in _stream_lines(self._ifaddr_cmd, timeout=5):
+                match = _INET_RE.search(line)
+                if not match:
+                    continue
+                ip, prefix, netmask = match.groups('')
+                if ip.startswith('127.'):
+                    continue
+                if netmask.startswith('0x'):
+                    # ifconfig on macOS prints the netmask in hex; its set bits are the prefix length
+                    prefix = int(netmask, 16).bit_count()
+                interfaces.append(ipaddress.IPv4Interface((ip, prefix or netmask)))
+        except Exception as e:
+            logger.warning("Error reading network interfaces: %s", e)
+        return interfaces
+
+    async def _scan_network_async(self, known_ips: Iterable[str] = ()) -> List[NeighborEntry]:
+        """Scan the network to find devices not in ARP table (concurrent TCP probes)"""
         devices = []
         try:
-            # Get the current network interface IP to determine subnet
-            if platform.system() == "Darwin":  # macOS
-                result = subprocess.run(['ifconfig'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    # Find the main network interface IP
-                    for line in result.stdout.split('\n'):
-                        if 'inet ' in line and not line.strip().startswith('inet 127.0.0.1'):
-                            # Extract IP and netmask
-                            parts = line.strip().split()
-                            ip = None
-                            netmask = None
-                            for i, part in enumerate(parts):
-                                if part == 'inet':
-                                    ip = parts[i + 1]
-                                elif part == 'netmask':
-                                    netmask = parts[i + 1]
-                            
-                            if ip and netmask:
-                                # Convert netmask to CIDR notation
-                                if netmask.startswith('0x'):
-                                    # Hex netmask
-                                    netmask_int = int(netmask, 16)
-                                    cidr = bin(netmask_int).count('1')
-                                else:
-                                    # Decimal netmask
-                                    cidr = sum(bin(int(x)).count('1') for x in netmask.split('.'))
-                                
-                                # Calculate network range
-                                ip_parts = ip.split('.')
-                                if len(ip_parts) == 4:
-                                    network = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.0/{cidr}"
-                                    print(f"Scanning network: {network}")
-                                    
-                                    # Scan the network (limited to /24 for speed) using threads
-                                    if cidr >= 24:
-                                        base_ip = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}"
-                                        
-                                        # Use ThreadPoolExecutor for concurrent pings
-                                        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-                                            # Submit ping tasks
-                                            future_to_ip = {
-                                                executor.submit(self._ping_host, f"{base_ip}.{i}"): f"{base_ip}.{i}"
-                                                for i in range(1, 255)  # Skip .0 and .255
-                                            }
-                                            
-                                            # Collect results with timeout
-                                            for future in concurrent.futures.as_completed(future_to_ip, timeout=30):
-                                                ip = future_to_ip[future]
-                                                try:
-                                                    if future.result():
-                                                        # Try to get MAC address from ARP table
-                                                        mac = self._get_mac_from_arp(ip)
-                                                        devices.append({
-                                                            'ip': ip,
-                                                            'mac': mac if mac else 'Unknown',
-                                                            'hostname': ip,
-                                                            'type': 'scan'
-                                                        })
-                                                except Exception as e:
-                                                    print(f"Error pinging {ip}: {e}")
-                                    break
+            # The first local interface determines the subnet to scan
+            interfaces = self._local_ipv4_interfaces()
+            if interfaces:
+                network = interfaces[0].network
+                logger.info("Scanning network: %s", network)
+                
+                # Scan the network (limited to /24 for speed)
+                if network.prefixlen >= 24:
+                    # Probe every host the ARP table doesn't already list, all at once; no
+                    # process or thread per host. The ICMP sweep runs on one socket and, with
+                    # scapy, an L2 ARP sweep on another, both alongside the TCP connects
+                    loop = asyncio.get_running_loop()
+                    known_ips = set(known_ips)
+                    ips = [ip for ip in _host_ips(network) if ip not in known_ips]
+                    if not ips:
+                        return devices
+                    icmp_sweep = loop.run_in_executor(self._probe_pool, _icmp_sweep, ips)
+                    arp_sweep = loop.run_in_executor(self._probe_pool, self._arp_sweep, ips) if HAS_SCAPY else None
+                    alive = await asyncio.gather(*(self._probe_host(ip) for ip in ips))
+                    try:
+                        icmp_alive = await icmp_sweep
+                    except OSError as e:
+                        logger.debug("ICMP sweep unavailable: %s", e)
+                        icmp_alive = set()
+                    swept_macs: Dict[str, str] = {}
+                    if arp_sweep is not None:
+                        try:
+                            swept_macs = await arp_sweep
+                        except Exception as e:
+                            # Raw sockets need root/CAP_NET_RAW; the other probes still count
+                            logger.debug("ARP sweep unavailable: %s", e)
+                    
+                    # Each probe made the kernel resolve the host's MAC, so one fresh
+                    # ARP read covers hosts that drop TCP as well as their MACs
+                    arp_macs = self._get_arp_map(max_age=0)
+                    for ip, up in zip(ips, alive):
+                        mac = swept_macs.get(ip) or arp_macs.get(ip)
+                        if up or ip in icmp_alive or mac:
+                            devices.append(NeighborEntry(ip, mac or 'Unknown', ip, 'scan'))
         except Exception as e:
-            print(f"Error scanning network: {e}")
+            logger.warning("Error scanning network: %s", e)
         
         return devices
 
+    def _arp_sweep(self, ips: List[str]) -> Dict[str, str]:
+        """Broadcast an ARP request for each ip and return IP -> MAC for the ones that replied"""
+        answered, _ = srp(Ether(dst='ff:ff:ff:ff:ff:ff') / ARP(pdst=ips), timeout=1, verbose=False)
+        return {reply.psrc: reply.hwsrc for _, reply in answered}
+
+    async def _probe_host(self, ip: str, port: int = 80, timeout: float = 1.0) -> bool:
+        """Check if a host is up with a non-blocking TCP connect; a refusal still means up"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+            writer.close()
+            return True
+        except ConnectionRefusedError:
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+    async def _probe_tcp(self, host: str, port: int, timeout: float = 1.0) -> bool:
+        """Check that a TCP connection to host:port completes"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+            writer.close()
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+    async def _resolve_error(self, host: str, timeout: float = 1.0) -> Optional[str]:
+        """Resolve host with a bounded wait; None on success, else the error text"""
+        try:
+            await asyncio.wait_for(asyncio.get_running_loop().getaddrinfo(host, None), timeout)
+            return None
+        except asyncio.TimeoutError:
+            return f"Timed out resolving {host}"
+        except OSError as e:
+            return str(e)
+
+    async def _probe_external(self, hosts: List[str], targets: List[Tuple[str, int]]) -> Tuple[List[Optional[str]], List[bool]]:
+        """Run the DNS lookups and TCP probes together; DNS is skipped while a recent success holds"""
+        if time.monotonic() < self._dns_ok_until:
+            return [None] * len(hosts), await self._probe_tcp_all(targets)
+        dns_errors, reachable = await asyncio.gather(
+            asyncio.gather(*(self._resolve_error(host) for host in hosts)),
+            self._probe_tcp_all(targets)
+        )
+        if not any(dns_errors):
+            self._dns_ok_until = time.monotonic() + self.DNS_OK_TTL_SEC
+        return list(dns_errors), reachable
+
+    async def _probe_tcp_all(self, targets: List[Tuple[str, int]]) -> List[bool]:
+        """Probe all (host, port) targets concurrently, preserving order"""
+        return list(await asyncio.gather(*(self._probe_tcp(host, port) for host, port in targets)))
+
     def _ping_host(self, ip: str) -> bool:
         """Ping a host to check if it's alive"""
         try:
-            if platform.system() == "Darwin":  # macOS
-                result = subprocess.run(['ping', '-c', '1', '-W', '1000', ip], 
-                                      capture_output=True, text=True, timeout=2)
-            else:  # Linux
-                result = subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                                      capture_output=True, text=True, timeout=2)
+            result = subprocess.run(self._ping_argv + [ip], capture_output=True, text=True, timeout=2)
             return result.returncode == 0
         except:
             return False
 
-    def _get_arp_table(self) -> List[Dict[str, str]]:
-        """Get ARP table to find devices on the network"""
-        devices = []
+    def _get_arp_table(self, max_age: float = ARP_TABLE_TTL_SEC) -> List[NeighborEntry]:
+        """Get ARP table to find devices on the network; reuses a read younger than max_age.
+
+        The list may be shared with other callers, so treat it as read-only.
+        """
+        if self._arp_cmd is None:
+            return []
+        cached = self._arp_table
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
         try:
-            if platform.system() == "Darwin":  # macOS
-                result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    # Parse ARP output: "? (192.168.1.1) at 28:80:88:34:f1:79 on en0 ifscope [ethernet]"
-                    for line in result.stdout.split('\n'):
-                        line = line.strip()
-                        if not line or '(incomplete)' in line or 'broadcast' in line.lower() or 'mcast' in line.lower():
-                            continue
-                            
-                        # Match pattern: "? (192.168.1.1) at 28:80:88:34:f1:79 on en0 ifscope [ethernet]"
-                        match = re.search(r'\(([0-9.]+)\) at ([0-9a-fA-F:]+)', line)
-                        if match:
-                            ip = match.group(1)
-                            mac = match.group(2)
-                            
-                            # Skip broadcast and multicast addresses
-                            if ip.startswith('224.') or ip.startswith('239.') or ip == '255.255.255.255':
-                                continue
-                                
-                            # Extract hostname (everything before the first parenthesis)
-                            hostname_match = re.search(r'^([^(]+)', line)
-                            hostname = hostname_match.group(1).strip() if hostname_match else ip
-                            
-                            # Clean up hostname
-                            if hostname == '?' or hostname == '':
-                                hostname = ip
-                            
-                            devices.append({
-                                'ip': ip,
-                                'mac': mac,
-                                'hostname': hostname,
-                                'type': 'arp'
-                            })
-            elif platform.system() == "Linux":
-                result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        line = line.strip()
-                        if not line or '(incomplete)' in line or 'broadcast' in line.lower() or 'mcast' in line.lower():
-                            continue
-                            
-                        match = re.search(r'\(([0-9.]+)\) at ([0-9a-fA-F:]+)', line)
-                        if match:
-                            ip = match.group(1)
-                            mac = match.group(2)
-                            
-                            # Skip broadcast and multicast addresses
-                            if ip.startswith('224.') or ip.startswith('239.') or ip == '255.255.255.255':
-                                continue
-                                
-                            hostname_match = re.search(r'^([^(]+)', line)
-                            hostname = hostname_match.group(1).strip() if hostname_match else ip
-                            
-                            if hostname == '?' or hostname == '':
-                                hostname = ip
-                            
-                            devices.append({
-                                'ip': ip,
-                                'mac': mac,
-                                'hostname': hostname,
-                                'type': 'arp'
-                            })
+            if self._use_proc_arp:
+                with open(_PROC_NET_ARP) as f:
+                    devices = self._parse_proc_arp(f)
+            else:
+                devices = self._parse_arp(_stream_lines(self._arp_cmd, timeout=10))
         except Exception as e:
-            print(f"Error getting ARP table: {e}")
+            logger.warning("Error getting ARP table: %s", e)
+            return []
+        self._arp_table = (time.monotonic(), devices)
         return devices
 
-    def _get_device_info(self, ip: str) -> Dict[str, str]:
+    def _get_arp_map(self, max_age: float = ARP_TABLE_TTL_SEC) -> Dict[str, str]:
+        """IP -> MAC from one read of the ARP table"""
+        return {device.ip: device.mac for device in self._get_arp_table(max_age)}
+
+    @staticmethod
+    def _parse_proc_arp(lines: Iterable[str]) -> List[NeighborEntry]:
+        """Parse /proc/net/arp: "IP address  HW type  Flags  HW address  Mask  Device" rows"""
+        devices = []
+        for line in itertools.islice(lines, 1, None):
+            fields = line.split()
+            if len(fields) < 4 or not int(fields[2], 16) & _ATF_COM:
+                continue
+            ip, mac = fields[0], fields[3]
+            if ip.startswith(_SKIP_IP_PREFIXES):
+                continue
+            devices.append(NeighborEntry(ip, mac, ip, 'arp'))
+        return devices
+
+    @staticmethod
+    def _parse_arp(lines: Iterable[str]) -> List[NeighborEntry]:
+        """Parse `arp -a` output (same format on macOS and Linux)"""
+        devices = []
+        for line in lines:
+            # "(incomplete)" entries have no MAC after "at", so they never match
+            match = _ARP_ENTRY_RE.match(line.strip())
+            if not match:
+                continue
+            host, ip, mac = match.group('host', 'ip', 'mac')
+            
+            # Skip broadcast and multicast addresses
+            if ip.startswith(_SKIP_IP_PREFIXES):
+                continue
+            
+            # "?" is arp's placeholder for an unresolved name
+            hostname = host.strip()
+            if hostname in _EMPTY_HOSTS:
+                hostname = ip
+            
+            devices.append(NeighborEntry(ip, mac, hostname, 'arp'))
+        return devices
+
+    def _cached_ptr(self, ip: str) -> Tuple[bool, Optional[str]]:
+        """(hit, hostname) from the reverse-DNS cache"""
+        cached = self._rdns_cache.get(ip)
+        if cached is not None and time.monotonic() - cached[0] < self.RDNS_TTL_SEC:
+            return True, cached[1]
+        return False, None
+
+    def _resolve_ptr(self, ip: str) -> Optional[str]:
+        """Blocking reverse-DNS lookup through the cache; None where there is no PTR record"""
+        hit, hostname = self._cached_ptr(ip)
+        if hit:
+            return hostname
+        try:
+            hostname = socket.gethostbyaddr(ip)[0]
+        except (OSError, UnicodeError):
+            hostname = None
+        self._rdns_cache[ip] = (time.monotonic(), hostname)
+        return hostname
+
+    async def _resolve_hostnames(self, ips: List[str]) -> Dict[str, Optional[str]]:
+        """Reverse-resolve all ips concurrently; None where there is no PTR record"""
+        loop = asyncio.get_running_loop()
+        hostnames: Dict[str, Optional[str]] = {}
+        misses = []
+        for ip in dict.fromkeys(ips):
+            hit, hostnames[ip] = self._cached_ptr(ip)
+            if not hit:
+                misses.append(ip)
+        
+        async def resolve(ip: str) -> Optional[str]:
+            try:
+                host, _ = await loop.getnameinfo((ip, 0), socket.NI_NAMEREQD)
+                return host
+            except (OSError, UnicodeError):
+                return None
+        
+        resolved = await asyncio.gather(*(resolve(ip) for ip in misses))
+        now = time.monotonic()
+        for ip, hostname in zip(misses, resolved):
+            hostnames[ip] = hostname
+            self._rdns_cache[ip] = (now, hostname)
+        return hostnames
+
+    def _get_device_info(self, ip: str, hostname: Optional[str] = None) -> Dict[str, str]:
         """Get device information using multiple methods"""
         device_info = {
             'ip': ip,
@@ -219,40 +713,23 @@ class FastDiscoveryService:
             'status': 'up'
         }
         
-        # Try to get hostname via reverse DNS
-        try:
-            hostname = socket.gethostbyaddr(ip)[0]
-            device_info['hostname'] = hostname
-        except:
-            pass
+        device_info['type'] = 'device'
+        
+        # Try to get hostname via reverse DNS, unless the caller already resolved it
+        if not hostname:
+            hostname = self._resolve_ptr(ip)
+            if not hostname:
+                # A bare IP matches none of the hostname patterns
+                return device_info
+        device_info['hostname'] = hostname
         
         # Try to determine device type based on hostname patterns
-        hostname_lower = device_info['hostname'].lower()
-        if any(keyword in hostname_lower for keyword in ['router', 'gateway', 'ap', 'access-point']):
-            device_info['type'] = 'router'
-            device_info['vendor'] = 'Router'
-        elif any(keyword in hostname_lower for keyword in ['switch', 'sw']):
-            device_info['type'] = 'switch'
-            device_info['vendor'] = 'Switch'
-        elif any(keyword in hostname_lower for keyword in ['printer', 'print']):
-            device_info['type'] = 'printer'
-            device_info['vendor'] = 'Printer'
-        elif any(keyword in hostname_lower for keyword in ['nas', 'storage', 'server']):
-            device_info['type'] = 'server'
-            device_info['vendor'] = 'Server'
-        elif any(keyword in hostname_lower for keyword in ['iphone', 'ipad', 'android', 'phone']):
-            device_info['type'] = 'mobile'
-            device_info['vendor'] = 'Mobile'
-        elif any(keyword in hostname_lower for keyword in ['laptop', 'desktop', 'pc', 'mac']):
-            device_info['type'] = 'computer'
-            device_info['vendor'] = 'Computer'
-        else:
-            device_info['type'] = 'device'
-            device_info['vendor'] = 'Unknown'
+        device_info['vendor'], device_info['type'] = self._classify(None, hostname.lower())
         
         return device_info
 
-    def _get_device_info_hybrid(self, ip: str, mac: str) -> Dict[str, str]:
+    async def _get_device_info_hybrid(self, ip: str, mac: str, hostname: Optional[str] = None,
+                                      upnp_map: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """Get device information using hybrid approach with multiple methods in parallel"""
         device_info = {
             'ip': ip,
@@ -262,185 +739,176 @@ class FastDiscoveryService:
             'type': 'unknown',
             'status': 'up'
         }
+        loop = asyncio.get_running_loop()
         
-        # Try to get hostname via reverse DNS first (fast)
-        try:
-            hostname = socket.gethostbyaddr(ip)[0]
+        # Try to get hostname via reverse DNS first (fast), unless the caller already resolved it
+        if not hostname:
+            hostname = (await self._resolve_hostnames([ip]))[ip]
+        if hostname:
             device_info['hostname'] = hostname
-        except:
-            pass
-        
-        # Use threading to try multiple discovery methods in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all discovery methods
-            future_snmp = executor.submit(self._get_device_info_snmp, ip)
-            future_http = executor.submit(self._get_device_info_http, ip)
-            future_upnp = executor.submit(self._get_device_info_upnp, ip)
-            future_services = executor.submit(self._get_device_info_services, ip)
-            
-            # Wait for the first successful result with timeout
-            futures = [future_snmp, future_http, future_upnp, future_services]
-            method_names = ['SNMP', 'HTTP', 'UPnP', 'Services']
-            
-            for future, method_name in zip(futures, method_names):
-                try:
-                    result = future.result(timeout=0.5)  # Reduced to 0.5 second timeout per method
-                    if result and result.get('model') != 'Unknown':
-                        print(f"✅ {method_name} discovery successful for {ip}: {result.get('model')}")
-                        device_info.update(result)
-                        # Cancel remaining futures
-                        for f in futures:
-                            if f != future and not f.done():
-                                f.cancel()
-                        break
-                except (concurrent.futures.TimeoutError, Exception) as e:
-                    # Don't print every failure to reduce noise
-                    continue
         
-        # Fallback to basic device type detection
+        # UPnP answers come from the pass-wide SSDP sweep; a model there needs no probing
+        upnp_model = (upnp_map or {}).get(ip)
+        if upnp_model:
+            logger.debug("UPnP discovery successful for %s: %s", ip, upnp_model)
+            device_info.update({'model': upnp_model, 'type': 'device', 'vendor': self._get_vendor_from_mac(mac)})
+            return device_info
+
+        # Run every discovery method at once; SNMP and HTTP are native async, banners use the executor
+        methods = [
+            ('SNMP', asyncio.ensure_future(self._get_device_info_snmp(ip))),
+            ('HTTP', asyncio.ensure_future(self._get_device_info_http(ip))),
+            ('Services', loop.run_in_executor(self._probe_pool, self._get_device_info_services, ip)),
+        ]
+        # The first method to come back with a model wins; the rest are cancelled
+        method_names = {future: method_name for method_name, future in methods}
+        pending = set(method_names)
+        deadline = loop.time() + self.DEVICE_PROBE_TIMEOUT_SEC
+        result = None
+        while pending and result is None:
+            done, pending = await asyncio.wait(
+                pending, timeout=deadline - loop.time(), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                # Checking exception() also marks failures as retrieved
+                if future.cancelled() or future.exception() is not None or result is not None:
+                    continue
+                candidate = future.result()
+                if candidate and candidate.get('model') != 'Unknown':
+                    logger.debug("%s discovery successful for %s: %s", method_names[future], ip, candidate.get('model'))
+                    result = candidate
+        if result is not None:
+            device_info.update(result)
+        for _, future in methods:
+            future.cancel()
+        
+        # Vendor comes from the MAC's OUI when known; without a model, hostname keywords
+        # also supply the type and a fallback vendor
         if device_info['model'] == 'Unknown':
-            hostname_lower = device_info['hostname'].lower()
-            if any(keyword in hostname_lower for keyword in ['router', 'gateway', 'ap', 'access-point']):
-                device_info['type'] = 'router'
-                device_info['vendor'] = 'Router'
-            elif any(keyword in hostname_lower for keyword in ['switch', 'sw']):
-                device_info['type'] = 'switch'
-                device_info['vendor'] = 'Switch'
-            elif any(keyword in hostname_lower for keyword in ['printer', 'print']):
-                device_info['type'] = 'printer'
-                device_info['vendor'] = 'Printer'
-            elif any(keyword in hostname_lower for keyword in ['nas', 'storage', 'server']):
-                device_info['type'] = 'server'
-                device_info['vendor'] = 'Server'
-            elif any(keyword in hostname_lower for keyword in ['iphone', 'ipad', 'android', 'phone']):
-                device_info['type'] = 'mobile'
-                device_info['vendor'] = 'Mobile'
-            elif any(keyword in hostname_lower for keyword in ['laptop', 'desktop', 'pc', 'mac']):
-                device_info['type'] = 'computer'
-                device_info['vendor'] = 'Computer'
-            else:
-                device_info['type'] = 'device'
-                device_info['vendor'] = 'Unknown'
+            device_info['vendor'], device_info['type'] = self._classify(mac, device_info['hostname'].lower())
+        else:
+            device_info['vendor'] = self._get_vendor_from_mac(mac)
         
         return device_info
 
-    def _get_device_info_snmp(self, ip: str) -> Optional[Dict[str, str]]:
+    async def _get_device_info_snmp(self, ip: str) -> Optional[Dict[str, str]]:
         """Get device info via SNMP"""
         try:
-            # Try sysDescr first
-            result = subprocess.run(['snmpget', '-v2c', '-c', 'public', ip, '1.3.6.1.2.1.1.1.0'], 
-                                  capture_output=True, text=True, timeout=1)  # Reduced timeout
-            if result.returncode == 0:
-                sys_descr = result.stdout.strip()
-                if '=' in sys_descr:
-                    sys_descr = sys_descr.split('=', 1)[1].strip().strip('"')
-                
-                # Parse model from sysDescr
+            # sysDescr and sysObjectID in a single GET
+            values = await snmp_get(ip, ['1.3.6.1.2.1.1.1.0', '1.3.6.1.2.1.1.2.0'], timeout=1.0)
+            if not values:
+                return None
+            sys_descr, sys_oid = values
+            
+            # Parse model from sysDescr
+            if isinstance(sys_descr, str):
                 model = self._parse_model_from_sysdescr(sys_descr)
                 if model != 'Unknown':
                     return {'model': model, 'type': 'router' if 'router' in sys_descr.lower() else 'device'}
             
             # Try sysObjectID as fallback
-            result = subprocess.run(['snmpget', '-v2c', '-c', 'public', ip, '1.3.6.1.2.1.1.2.0'], 
-                                  capture_output=True, text=True, timeout=1)  # Reduced timeout
-            if result.returncode == 0:
-                sys_oid = result.stdout.strip()
+            if isinstance(sys_oid, str):
                 model = self._parse_model_from_oid(sys_oid)
                 if model != 'Unknown':
                     return {'model': model, 'type': 'device'}
                     
         except Exception as e:
-            print(f"SNMP discovery error for {ip}: {e}")
+            logger.debug("SNMP discovery error for %s: %s", ip, e)
         
         return None
 
-    def _get_device_info_http(self, ip: str) -> Optional[Dict[str, str]]:
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                verify=False,
+                timeout=httpx.Timeout(0.5, pool=None),
+                limits=httpx.Limits(max_connections=256)
+            )
+            self._http_client_loop = loop
+        return self._http_client
+
+    async def _get_device_info_http(self, ip: str) -> Optional[Dict[str, str]]:
         """Get device info via HTTP requests"""
+        client = self._get_http_client()
+        
+        async def fetch_model(url: str) -> str:
+            response = await client.get(url)
+            if response.status_code != 200:
+                return 'Unknown'
+            # Parse title and content for model information
+            return self._parse_model_from_html(response.text)
+        
+        # Try common ports and paths, all at once; the first page naming a model wins
+        urls_to_try = [
+            f'http://{ip}/',
+            f'http://{ip}:8080/',
+            f'https://{ip}/',
+            f'http://{ip}/status',
+            f'http://{ip}/info',
+            f'http://{ip}/device'
+        ]
+        tasks = [asyncio.ensure_future(fetch_model(url)) for url in urls_to_try]
         try:
-            # Try common ports and paths
-            urls_to_try = [
-                f'http://{ip}/',
-                f'http://{ip}:8080/',
-                f'https://{ip}/',
-                f'http://{ip}/status',
-                f'http://{ip}/info',
-                f'http://{ip}/device'
-            ]
-            
-            for url in urls_to_try:
+            for next_done in asyncio.as_completed(tasks):
                 try:
-                    response = requests.get(url, timeout=0.5, verify=False)  # Reduced timeout
-                    if response.status_code == 200:
-                        # Parse title and content for model information
-                        model = self._parse_model_from_html(response.text)
-                        if model != 'Unknown':
-                            return {'model': model, 'type': 'device'}
-                except:
+                    model = await next_done
+                except Exception:
                     continue
-                    
+                if model != 'Unknown':
+                    return {'model': model, 'type': 'device'}
         except Exception as e:
-            print(f"HTTP discovery error for {ip}: {e}")
+            logger.debug("HTTP discovery error for %s: %s", ip, e)
+        finally:
+            for task in tasks:
+                task.cancel()
         
         return None
 
-    def _get_device_info_upnp(self, ip: str) -> Optional[Dict[str, str]]:
-        """Get device info via UPnP/SSDP discovery"""
+    def _ssdp_sweep(self, timeout: float = 3.0) -> Dict[str, str]:
+        """Send one SSDP M-SEARCH and collect UPnP models by responder IP"""
+        models: Dict[str, str] = {}
         try:
-            # Send SSDP M-SEARCH request
-            ssdp_request = (
-                "M-SEARCH * HTTP/1.1\r\n"
-                "HOST: 239.255.255.250:1900\r\n"
-                "MAN: \"ssdp:discover\"\r\n"
-                "ST: upnp:rootdevice\r\n"
-                "MX: 3\r\n\r\n"
-            )
-            
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(2)
-            sock.sendto(ssdp_request.encode(), ('239.255.255.250', 1900))
-            
-            try:
-                data, addr = sock.recvfrom(1024)
-                if addr[0] == ip:
-                    response = data.decode()
-                    model = self._parse_model_from_upnp(response)
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+                sock.sendto(_SSDP_BYTES, _SSDP_ADDR)
+                # Replies trickle in over MX seconds; keep reading until the deadline
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    sock.settimeout(remaining)
+                    try:
+                        data, addr = sock.recvfrom(4096)
+                    except socket.timeout:
+                        break
+                    model = self._parse_model_from_upnp(data.decode(errors='replace'))
                     if model != 'Unknown':
-                        return {'model': model, 'type': 'device'}
-            except socket.timeout:
-                pass
-            finally:
-                sock.close()
-                
+                        models.setdefault(addr[0], model)
         except Exception as e:
-            print(f"UPnP discovery error for {ip}: {e}")
-        
-        return None
+            logger.debug("SSDP sweep error: %s", e)
+
+        return models
 
     def _get_device_info_services(self, ip: str) -> Optional[Dict[str, str]]:
         """Get device info via service banner detection"""
         try:
-            # Common ports to check
-            ports_to_check = [22, 23, 80, 443, 8080, 8443, 161, 162]
+            # Common ports to check, all connected and read at once under one deadline
+            banners = _read_tcp_banners(ip, _BANNER_PORTS, timeout=1.5)
             
-            for port in ports_to_check:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)
-                    result = sock.connect_ex((ip, port))
-                    if result == 0:
-                        # Port is open, try to get banner
-                        banner = self._get_service_banner(ip, port)
-                        if banner:
-                            model = self._parse_model_from_banner(banner, port)
-                            if model != 'Unknown':
-                                sock.close()
-                                return {'model': model, 'type': 'device'}
-                    sock.close()
-                except:
-                    continue
+            for port in _BANNER_PORTS:
+                banner = banners.get(port)
+                if banner:
+                    model = self._parse_model_from_banner(banner.decode('utf-8', errors='ignore'), port)
+                    if model != 'Unknown':
+                        return {'model': model, 'type': 'device'}
                     
         except Exception as e:
-            print(f"Service discovery error for {ip}: {e}")
+            logger.debug("Service discovery error for %s: %s", ip, e)
         
         return None
 
@@ -449,21 +917,9 @@ class FastDiscoveryService:
         if not sys_descr:
             return 'Unknown'
         
-        # Common patterns in sysDescr
-        patterns = [
-            r'(\w+)\s+Router',  # "Orbi Router"
-            r'(\w+)\s+Switch',  # "Cisco Switch"
-            r'(\w+)\s+AP',      # "Unifi AP"
-            r'Model:\s*(\w+)',  # "Model: B0210"
-            r'(\w+)\s+\d+',     # "Netgear R7000"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, sys_descr, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return 'Unknown'
+        # Exactly one alternative captures, and it is the last group set
+        match = _SYSDESCR_MODEL_RE.match(sys_descr)
+        return match.group(match.lastindex) if match else 'Unknown'
 
     def _parse_model_from_oid(self, sys_oid: str) -> str:
         """Parse model from SNMP sysObjectID"""
@@ -477,27 +933,17 @@ class FastDiscoveryService:
             return 'Unknown'
         
         # Look for title tags
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', html_content, re.IGNORECASE)
+        title_match = _HTML_TITLE_RE.search(html_content)
         if title_match:
             title = title_match.group(1)
             # Extract model from title
-            model_match = re.search(r'(\w+)\s+(Router|Switch|AP|Device)', title, re.IGNORECASE)
+            model_match = _TITLE_MODEL_RE.search(title)
             if model_match:
                 return model_match.group(1)
         
         # Look for model in meta tags or content
-        model_patterns = [
-            r'Model[:\s]+(\w+)',
-            r'Device[:\s]+(\w+)',
-            r'Product[:\s]+(\w+)'
-        ]
-        
-        for pattern in model_patterns:
-            match = re.search(pattern, html_content, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return 'Unknown'
+        match = _HTML_MODEL_RE.match(html_content)
+        return match.group(match.lastindex) if match else 'Unknown'
 
     def _parse_model_from_upnp(self, upnp_response: str) -> str:
         """Parse model from UPnP response"""
@@ -505,31 +951,12 @@ class FastDiscoveryService:
             return 'Unknown'
         
         # Look for model in UPnP headers
-        model_match = re.search(r'MODEL[:\s]+([^\r\n]+)', upnp_response, re.IGNORECASE)
+        model_match = _UPNP_MODEL_RE.search(upnp_response)
         if model_match:
             return model_match.group(1).strip()
         
         return 'Unknown'
 
-    def _get_service_banner(self, ip: str, port: int) -> Optional[str]:
-        """Get service banner from open port"""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            sock.connect((ip, port))
-            
-            # Try to receive some data
-            sock.settimeout(0.5)
-            try:
-                banner = sock.recv(1024).decode('utf-8', errors='ignore')
-                return banner
-            except:
-                return None
-            finally:
-                sock.close()
-        except:
-            return None
-
     def _parse_model_from_banner(self, banner: str, port: int) -> str:
         """Parse model from service banner"""
         if not banner:
@@ -544,7 +971,7 @@ class FastDiscoveryService:
         
         # HTTP banners
         if port in [80, 443, 8080, 8443]:
-            server_match = re.search(r'Server[:\s]+([^\r\n]+)', banner, re.IGNORECASE)
+            server_match = _SERVER_HEADER_RE.search(banner)
             if server_match:
                 return server_match.group(1).strip()
         
@@ -552,115 +979,54 @@ class FastDiscoveryService:
 
     def _check_network_connectivity(self) -> Dict[str, Any]:
         """Check if the network is connected by testing multiple methods"""
-        import time
+        checked_at = self._connectivity_checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.CONNECTIVITY_TTL_SEC:
+            return self.network_status
         
         connectivity_tests = []
         
-        # Test 1: Check if we can resolve external DNS (most reliable test)
-        try:
-            socket.gethostbyname('google.com')
-            connectivity_tests.append(("DNS Resolution", True, None))
-        except Exception as e:
-            connectivity_tests.append(("DNS Resolution", False, str(e)))
-        
-        # Test 1b: Try to resolve another external domain
-        try:
-            socket.gethostbyname('cloudflare.com')
-            connectivity_tests.append(("DNS Resolution 2", True, None))
-        except Exception as e:
-            connectivity_tests.append(("DNS Resolution 2", False, str(e)))
+        # Tests 1 and 1b: external DNS resolution; tests 2, 3 and 3b: TCP reachability
+        lookups, probes = _CONNECTIVITY_LOOKUPS, _CONNECTIVITY_PROBES
         
-        # Test 2: Check if we can reach external internet (critical test)
-        try:
-            # Try to connect to a reliable external service
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)  # Very short timeout for faster detection
-            result = sock.connect_ex(('8.8.8.8', 53))  # Google DNS
-            sock.close()
-            if result == 0:
-                connectivity_tests.append(("Internet Access", True, "Can reach 8.8.8.8"))
-            else:
-                connectivity_tests.append(("Internet Access", False, "Cannot reach 8.8.8.8"))
-        except Exception as e:
-            connectivity_tests.append(("Internet Access", False, str(e)))
-        
-        # Test 3: Check if we can reach another external service
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('1.1.1.1', 53))  # Cloudflare DNS
-            sock.close()
-            if result == 0:
-                connectivity_tests.append(("External Service", True, "Can reach 1.1.1.1"))
-            else:
-                connectivity_tests.append(("External Service", False, "Cannot reach 1.1.1.1"))
-        except Exception as e:
-            connectivity_tests.append(("External Service", False, str(e)))
+        async def run_tests():
+            # Test 4 reads local interfaces and may fork; it overlaps the network probes
+            return await asyncio.gather(
+                self._probe_external(_CONNECTIVITY_LOOKUP_HOSTS, _CONNECTIVITY_PROBE_TARGETS),
+                asyncio.to_thread(self._local_ipv4_interfaces)
+            )
         
-        # Test 3b: Try to reach a web server (HTTP)
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('httpbin.org', 80))  # HTTP service
-            sock.close()
-            if result == 0:
-                connectivity_tests.append(("HTTP Service", True, "Can reach httpbin.org"))
-            else:
-                connectivity_tests.append(("HTTP Service", False, "Cannot reach httpbin.org"))
-        except Exception as e:
-            connectivity_tests.append(("HTTP Service", False, str(e)))
+        # Callers run this check in a worker thread, so it can drive its own event loop
+        (dns_errors, reachable), interfaces = _run_coro(run_tests())
+        for (name, _), error in zip(lookups, dns_errors):
+            connectivity_tests.append((name, error is None, error))
+        for (name, host, _), ok in zip(probes, reachable):
+            connectivity_tests.append((name, ok, f"Can reach {host}" if ok else f"Cannot reach {host}"))
         
         # Test 4: Check if we have active network interfaces (but don't rely on this alone)
-        try:
-            if platform.system() == "Darwin":  # macOS
-                result = subprocess.run(['ifconfig'], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0:
-                    # Look for active interfaces with IP addresses
-                    has_active_interface = False
-                    for line in result.stdout.split('\n'):
-                        if 'inet ' in line and not line.strip().startswith('inet 127.0.0.1'):  # Exclude localhost
-                            has_active_interface = True
-                            break
-                    if has_active_interface:
-                        connectivity_tests.append(("Network Interfaces", True, "Active interfaces found"))
-                    else:
-                        connectivity_tests.append(("Network Interfaces", False, "No active interfaces"))
-                else:
-                    connectivity_tests.append(("Network Interfaces", False, "ifconfig failed"))
-            else:  # Linux
-                result = subprocess.run(['ip', 'addr'], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0:
-                    has_active_interface = False
-                    for line in result.stdout.split('\n'):
-                        if 'inet ' in line and not '127.0.0.1' in line:  # Exclude localhost
-                            has_active_interface = True
-                            break
-                    if has_active_interface:
-                        connectivity_tests.append(("Network Interfaces", True, "Active interfaces found"))
-                    else:
-                        connectivity_tests.append(("Network Interfaces", False, "No active interfaces"))
-                else:
-                    connectivity_tests.append(("Network Interfaces", False, "ip addr failed"))
-        except Exception as e:
-            connectivity_tests.append(("Network Interfaces", False, str(e)))
-        
-        # Determine overall connectivity - require external connectivity
-        successful_tests = sum(1 for test in connectivity_tests if test[1])
-        total_tests = len(connectivity_tests)
-        
-        # Require at least 3 out of 6 tests to pass, with external connectivity being critical
-        external_tests = [test for test in connectivity_tests if test[0] in ["DNS Resolution", "DNS Resolution 2", "Internet Access", "External Service", "HTTP Service"]]
-        external_successful = sum(1 for test in external_tests if test[1])
-        
-        # Must have at least 2 external connectivity tests pass
+        if interfaces:
+            connectivity_tests.append(("Network Interfaces", True, "Active interfaces found"))
+        else:
+            connectivity_tests.append(("Network Interfaces", False, "No active interfaces"))
+        
+        # Determine overall connectivity - require external connectivity.
+        # Bit i is set when test i passed; the five external tests come first
+        passed = 0
+        for i, test in enumerate(connectivity_tests):
+            passed |= test[1] << i
+        external_count = len(lookups) + len(probes)
+        successful_tests = passed.bit_count()
+        external_successful = (passed & ((1 << external_count) - 1)).bit_count()
+        
+        # Must have at least 2 external connectivity tests pass, and 3 of 6 overall
         is_connected = external_successful >= 2 and successful_tests >= 3
         
         self.network_status = {
             "connected": is_connected,
             "last_check": time.time(),
-            "error": None if is_connected else f"External connectivity failed: {external_successful}/{len(external_tests)} external tests passed",
+            "error": None if is_connected else f"External connectivity failed: {external_successful}/{external_count} external tests passed",
             "tests": connectivity_tests
         }
+        self._connectivity_checked_at = time.monotonic()
         
         return self.network_status
 
@@ -673,22 +1039,35 @@ class FastDiscoveryService:
         
         # Check cache first (unless force refresh)
         if not force_refresh:
+            if self._cache_hot_version == device_cache.version and time.monotonic() < self._cache_hot_expires:
+                return list(self._cache_hot)
             cached_devices = device_cache.get_cached_devices()
             if cached_devices:
-                print(f"✅ Using cached devices: {len(cached_devices)} devices")
+                logger.info("Using cached devices: %d devices", len(cached_devices))
                 return cached_devices
         
-        print("Starting fresh device discovery...")
-        all_devices = []
+        logger.info("Starting fresh device discovery")
+        
+        # Use simple ARP table discovery (fastest approach like Orbi interface). It reads the
+        # ARP table and queries user mappings, both blocking, so keep it off the event loop
+        logger.debug("Using simple ARP table discovery for speed")
+        all_devices = await asyncio.get_running_loop().run_in_executor(
+            self._probe_pool, self._get_simple_arp_devices, db
+        )
         
-        # Use simple ARP table discovery (fastest approach like Orbi interface)
-        print("Using simple ARP table discovery for speed...")
-        all_devices = self._get_simple_arp_devices(db)
+        # An empty ARP table (fresh boot, no arp on this platform) still leaves the
+        # network sweep, which finds hosts the kernel hasn't talked to yet
+        if not all_devices:
+            logger.info("ARP table empty, falling back to network scan")
+            all_devices = await self._discover_via_arp_fallback(db)
         
         # Update cache with new devices
         if all_devices:
             device_cache.update_cache(all_devices)
-            print(f"✅ Updated device cache with {len(all_devices)} devices")
+            self._cache_hot = list(all_devices)
+            self._cache_hot_expires = time.monotonic() + device_cache.cache_duration.total_seconds()
+            self._cache_hot_version = device_cache.version
+            logger.info("Updated device cache with %d devices", len(all_devices))
         
         return all_devices
     
@@ -699,30 +1078,30 @@ class FastDiscoveryService:
         try:
             # Get ARP table (fastest method)
             arp_devices = self._get_arp_table()
+            vendors = self._get_vendors_bulk(device.mac for device in arp_devices)
             
             # Process devices quickly
             for device in arp_devices:
-                vendor = self._get_vendor_from_mac(device['mac'])
+                vendor = vendors.get(device.mac, "Unknown")
                 
                 # Get device name (hostname or generate from vendor)
-                device_name = self._get_device_name(device['hostname'], vendor, device['ip'])
+                device_name = self._get_device_name(device.hostname, vendor, device.ip)
                 
-                # Determine connection type and IP version
-                connection_type = self._get_connection_type(device['mac'], vendor)
-                ip_version = self._get_ip_version(device['ip'])
+                # Determine connection type; the IP version comes with the ARP entry
+                connection_type = self._get_connection_type(device.mac, vendor)
                 
                 device_data = {
-                    'id': device['ip'],
+                    'id': device.ip,
                     'hostname': device_name,  # Use device name instead of IP
-                    'mgmtIp': device['ip'],
+                    'mgmtIp': device.ip,
                     'vendor': vendor,
                     'model': 'Unknown',  # Keep simple for speed
                     'status': 'up',
                     'type': 'device',
-                    'mac': device['mac'],
+                    'mac': device.mac,
                     'discovery_method': 'arp_simple',
                     'connection_type': connection_type,
-                    'ip_version': ip_version,
+                    'ip_version': device.ip_version,
                     'device_name': device_name
                 }
                 
@@ -732,10 +1111,10 @@ class FastDiscoveryService:
                 
                 devices.append(device_data)
             
-            print(f"✅ Simple ARP discovery found {len(devices)} devices")
+            logger.info("Simple ARP discovery found %d devices", len(devices))
             
         except Exception as e:
-            print(f"❌ Simple ARP discovery error: {e}")
+            logger.warning("Simple ARP discovery error: %s", e)
         
         return devices
     
@@ -747,14 +1126,7 @@ class FastDiscoveryService:
         
         # Generate name based on vendor and IP
         if vendor and vendor != "Unknown":
-            # Clean vendor name
-            vendor_clean = vendor.split()[0]  # Take first word
-            if vendor_clean.lower() in ['apple', 'samsung', 'google', 'microsoft']:
-                return f"{vendor_clean} Device"
-            elif vendor_clean.lower() in ['netgear', 'cisco', 'linksys']:
-                return f"{vendor_clean} Router"
-            else:
-                return f"{vendor_clean} Device"
+            return _vendor_device_name(vendor)
         
         # Fallback to IP-based name
         return f"Device-{ip.split('.')[-1]}"
@@ -764,48 +1136,14 @@ class FastDiscoveryService:
         if not mac or mac == "Unknown":
             return "Unknown"
         
-        # Check for known wireless vendors
-        wireless_vendors = [
-            'apple', 'samsung', 'google', 'microsoft', 'amazon', 'sony',
-            'lg', 'huawei', 'xiaomi', 'oneplus', 'motorola', 'nokia'
-        ]
-        
-        if vendor and any(wv in vendor.lower() for wv in wireless_vendors):
-            # Most modern devices support 5GHz, but we can't determine exact frequency from ARP
-            return "Wireless (2.4GHz/5GHz)"
-        
-        # Check for router/access point vendors
-        router_vendors = ['netgear', 'cisco', 'linksys', 'tp-link', 'd-link', 'asus']
-        if vendor and any(rv in vendor.lower() for rv in router_vendors):
-            return "Wired (Ethernet)"
-        
-        # Check for IoT/smart device vendors
-        iot_vendors = ['espressif', 'dyson', 'philips', 'nest', 'ring', 'arlo']
-        if vendor and any(iv in vendor.lower() for iv in iot_vendors):
-            return "Wireless (2.4GHz)"
-        
-        # Default assumption
-        return "Wireless (2.4GHz/5GHz)"
-    
-    def _get_ip_version(self, ip: str) -> str:
-        """Determine IP version"""
-        if not ip:
-            return "Unknown"
-        
-        # Check for IPv6
-        if ':' in ip:
-            return "IPv6"
-        
-        # Check for IPv4
-        if '.' in ip:
-            return "IPv4"
-        
-        return "Unknown"
+        return _vendor_connection_type(vendor)
     
     def _discover_via_router(self) -> List[Dict[str, Any]]:
         """Discover devices via router's device table (like Orbi interface)"""
         try:
-            router_service = RouterDiscoveryService()
+            if self._router_service is None:
+                self._router_service = RouterDiscoveryService()
+            router_service = self._router_service
             devices = router_service.get_router_device_table()
             
             # Process devices and add vendor/model information
@@ -833,69 +1171,88 @@ class FastDiscoveryService:
             return processed_devices
             
         except Exception as e:
-            print(f"Router discovery error: {e}")
+            logger.warning("Router discovery error: %s", e)
             return []
     
     async def _discover_via_arp_fallback(self, db: Session = None) -> List[Dict[str, Any]]:
         """Fallback to ARP table discovery"""
-        all_devices = []
-        
-        print("Starting ARP table fallback discovery...")
-        
-        # Check network connectivity first
-        print("Checking network connectivity...")
-        network_status = self._check_network_connectivity()
+        logger.info("Starting ARP table fallback discovery")
+        
+        # The connectivity check runs alongside the ARP read and network scan (blocking
+        # ones in the executor); gate on connectivity after
+        logger.debug("Checking network connectivity, ARP table and scanning network (concurrent)")
+        loop = asyncio.get_running_loop()
+        # The SSDP sweep listens for replies the whole time the other probes run
+        ssdp_sweep = loop.run_in_executor(self._probe_pool, self._ssdp_sweep)
+        network_check = loop.run_in_executor(self._probe_pool, self._check_network_connectivity)
+        # Hosts already in the ARP table are known to be up; the scan skips them
+        arp_devices = await loop.run_in_executor(self._probe_pool, self._get_arp_table)
+        network_status, scanned_devices = await asyncio.gather(
+            network_check,
+            self._scan_network_async(device.ip for device in arp_devices),
+            return_exceptions=True
+        )
+        if isinstance(network_status, BaseException):
+            raise network_status
         
         if not network_status["connected"]:
-            print(f"⚠️  Network connectivity issue detected: {network_status['error']}")
+            logger.warning("Network connectivity issue detected: %s", network_status['error'])
             # Return empty list but include network status
             return []
         
-        print("✅ Network connectivity confirmed")
+        logger.debug("Network connectivity confirmed")
         
-        # Get ARP table (fastest, most reliable for local network)
-        print("Checking ARP table...")
-        arp_devices = self._get_arp_table()
+        # The scan is optional; its failure is non-critical
+        if isinstance(scanned_devices, BaseException):
+            logger.info("Network scanning failed (non-critical): %s", scanned_devices)
+            scanned_devices = []
         
-        # Optionally scan network for additional devices (threaded, non-blocking)
-        scanned_devices = []
-        try:
-            print("Scanning network for additional devices (threaded)...")
-            scanned_devices = self._scan_network_async()
-        except Exception as e:
-            print(f"Network scanning failed (non-critical): {e}")
+        # Combine ARP and scanned devices, removing duplicates. A scanned host whose MAC the
+        # table already lists is another address of a known device; unresolved MACs can't tell
+        by_ip: Dict[str, NeighborEntry] = {device.ip: device for device in arp_devices}
+        seen_macs = {device.mac for device in arp_devices}
+        for device in scanned_devices:
+            if device.mac in seen_macs:
+                continue
+            if by_ip.setdefault(device.ip, device) is device:
+                if device.mac != 'Unknown':
+                    seen_macs.add(device.mac)
+                logger.debug("Found additional device via scan: %s", device.ip)
+        # The view keeps first-seen order and is walked twice below; no copy needed
+        all_devices = by_ip.values()
         
-        # Combine ARP and scanned devices, removing duplicates
-        all_devices = arp_devices.copy()
-        arp_ips = {device['ip'] for device in arp_devices}
+        logger.info("Found %d devices via ARP, %d via scan, %d total", len(arp_devices), len(scanned_devices), len(all_devices))
         
-        for device in scanned_devices:
-            if device['ip'] not in arp_ips:
-                all_devices.append(device)
-                print(f"Found additional device via scan: {device['ip']}")
+        # Resolve every PTR record at once instead of one blocking lookup per device
+        hostnames = await self._resolve_hostnames([device.ip for device in all_devices])
+        upnp_map = await ssdp_sweep
+        
+        # Use hybrid approach to get detailed device information, up to _probe_concurrency
+        # devices at once. A missing PTR record falls back to the IP, as a failed lookup did before
+        probe_slots = asyncio.Semaphore(self._probe_concurrency)
+        
+        async def enrich(device: NeighborEntry) -> Dict[str, str]:
+            async with probe_slots:
+                return await self._get_device_info_hybrid(
+                    device.ip, device.mac, hostnames.get(device.ip) or device.ip, upnp_map
+                )
         
-        print(f"Found {len(arp_devices)} devices via ARP, {len(scanned_devices)} via scan, {len(all_devices)} total")
+        device_infos = await asyncio.gather(*(enrich(device) for device in all_devices))
         
         # Process devices and create final device list
         final_devices = []
-        for device in all_devices:
-            vendor = self._get_vendor_from_mac(device['mac'])
-            
-            # Use hybrid approach to get detailed device information
-            device_info = self._get_device_info_hybrid(device['ip'], device['mac'])
-            
-            discovery_method = 'arp' if device['ip'] in arp_ips else 'scan'
-            
+        for device, device_info in zip(all_devices, device_infos):
             device_data = {
-                'id': device['ip'],
+                'id': device.ip,
                 'hostname': device_info['hostname'],
-                'mgmtIp': device['ip'],
-                'vendor': vendor if vendor != "Unknown" else device_info['vendor'],
+                'mgmtIp': device.ip,
+                'vendor': device_info['vendor'],
                 'model': device_info['model'],
                 'status': device_info['status'],
                 'type': device_info['type'],
-                'mac': device['mac'],
-                'discovery_method': discovery_method
+                'mac': device.mac,
+                # Sources tag their entries 'arp' or 'scan'
+                'discovery_method': device.type
             }
             
             # Apply user-defined mappings if database session is available
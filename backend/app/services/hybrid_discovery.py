@@ -1,5 +1,6 @@
 import asyncio
 import ipaddress
+import itertools
 import subprocess
 import socket
 import re
@@ -9,6 +10,8 @@ from typing import Any, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 import platform
 
+from .fast_discovery import classify_hostname
+
 
 class HybridDiscoveryService:
     def __init__(self, config: Dict[str, Any]):
@@ -16,6 +19,8 @@ class HybridDiscoveryService:
         self.timeout = config.get('timeout', 1)
         self.scan_networks = config.get('scan_networks', ['192.168.1.0/24'])
         self.oui_database = self._load_oui_database()
+        # Reused by every scan and discovery pass instead of a pool per call
+        self._executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="hybrid")
         
     def _load_oui_database(self) -> Dict[str, str]:
         """Load OUI (Organizationally Unique Identifier) database for MAC vendor lookup"""
@@ -498,31 +503,12 @@ class HybridDiscoveryService:
             hostname = socket.gethostbyaddr(ip)[0]
             device_info['hostname'] = hostname
         except:
-            pass
+            # A bare IP matches none of the hostname keywords
+            device_info['type'] = 'device'
+            return device_info
         
         # Try to determine device type based on hostname patterns
-        hostname_lower = device_info['hostname'].lower()
-        if any(keyword in hostname_lower for keyword in ['router', 'gateway', 'ap', 'access-point']):
-            device_info['type'] = 'router'
-            device_info['vendor'] = 'Router'
-        elif any(keyword in hostname_lower for keyword in ['switch', 'sw']):
-            device_info['type'] = 'switch'
-            device_info['vendor'] = 'Switch'
-        elif any(keyword in hostname_lower for keyword in ['printer', 'print']):
-            device_info['type'] = 'printer'
-            device_info['vendor'] = 'Printer'
-        elif any(keyword in hostname_lower for keyword in ['nas', 'storage', 'server']):
-            device_info['type'] = 'server'
-            device_info['vendor'] = 'Server'
-        elif any(keyword in hostname_lower for keyword in ['iphone', 'ipad', 'android', 'phone']):
-            device_info['type'] = 'mobile'
-            device_info['vendor'] = 'Mobile'
-        elif any(keyword in hostname_lower for keyword in ['laptop', 'desktop', 'pc', 'mac']):
-            device_info['type'] = 'computer'
-            device_info['vendor'] = 'Computer'
-        else:
-            device_info['type'] = 'device'
-            device_info['vendor'] = 'Unknown'
+        device_info['type'], device_info['vendor'] = classify_hostname(hostname.lower())
         
         return device_info
 
@@ -531,18 +517,18 @@ class HybridDiscoveryService:
         devices = []
         try:
             net = ipaddress.ip_network(network, strict=False)
-            # Limit to first 10 IPs to avoid long scans
-            ips_to_scan = list(net.hosts())[:10]
+            # Limit to first 10 IPs to avoid long scans; islice stops the host
+            # generator there instead of materializing the whole range
+            ips_to_scan = list(itertools.islice(net.hosts(), 10))
             
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                # Ping all IPs in parallel
-                futures = {executor.submit(self._ping_host, str(ip)): str(ip) for ip in ips_to_scan}
-                
-                for future in futures:
-                    ip = futures[future]
-                    if future.result():  # If ping successful
-                        device_info = self._get_device_info(ip)
-                        devices.append(device_info)
+            # Ping all IPs in parallel
+            futures = {self._executor.submit(self._ping_host, str(ip)): str(ip) for ip in ips_to_scan}
+            
+            for future in futures:
+                ip = futures[future]
+                if future.result():  # If ping successful
+                    device_info = self._get_device_info(ip)
+                    devices.append(device_info)
         except Exception as e:
             print(f"Error scanning network {network}: {e}")
         
@@ -558,23 +544,29 @@ class HybridDiscoveryService:
         # Method 1: ARP table (fastest, most reliable for local network)
         print("1. Checking ARP table...")
         arp_devices = self._get_arp_table()
+        new_arp_devices = []
         for device in arp_devices:
             if device['ip'] not in device_ips:
                 device_ips.add(device['ip'])
-                vendor = self._get_vendor_from_mac(device['mac'])
-                device_info = self._get_device_info(device['ip'])
-                
-                all_devices.append({
-                    'id': device['ip'],
-                    'hostname': device['hostname'],
-                    'mgmtIp': device['ip'],
-                    'vendor': vendor if vendor != "Unknown" else device_info['vendor'],
-                    'model': device_info['model'],
-                    'status': 'up',
-                    'type': device_info['type'],
-                    'mac': device['mac'],
-                    'discovery_method': 'arp'
-                })
+                new_arp_devices.append(device)
+        
+        # Reverse DNS dominates _get_device_info; overlap the lookups in threads
+        device_infos = list(self._executor.map(self._get_device_info, [d['ip'] for d in new_arp_devices]))
+        
+        for device, device_info in zip(new_arp_devices, device_infos):
+            vendor = self._get_vendor_from_mac(device['mac'])
+            
+            all_devices.append({
+                'id': device['ip'],
+                'hostname': device['hostname'],
+                'mgmtIp': device['ip'],
+                'vendor': vendor if vendor != "Unknown" else device_info['vendor'],
+                'model': device_info['model'],
+                'status': 'up',
+                'type': device_info['type'],
+                'mac': device['mac'],
+                'discovery_method': 'arp'
+            })
         
         print(f"Found {len(arp_devices)} devices via ARP table")
         
@@ -1,43 +1,149 @@
-import json
+import logging
+import mmap
 import os
 import re
+import time
+import orjson
+from functools import lru_cache
 import requests
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Separators that may appear in a MAC address; stripped with str.translate
+_MAC_SEPARATORS = str.maketrans('', '', ':-. ')
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
 
 class OuiDatabase:
     """OUI (Organizationally Unique Identifier) database manager"""
     
+    # Lookups notice a JSON rewritten by another process within this many seconds
+    RELOAD_CHECK_SEC = 60
+    
     def __init__(self, resources_dir: str = "resources"):
         self.resources_dir = Path(resources_dir)
         self.oui_file = self.resources_dir / "oui_database.json"
-        self.oui_data: Dict[str, Dict[str, str]] = {}
+        # Compact lookup index (parallel OUI/organization arrays); rebuilt from the JSON
+        # whenever it is older than the JSON. Plain data, so loading it runs no code
+        self.index_file = self.resources_dir / "oui_index.json"
+        self._oui_data: Optional[Dict[str, Dict[str, str]]] = None
+        # 24-bit OUI -> organization, rebuilt whenever oui_data changes
+        self._vendor_by_oui: Dict[int, str] = {}
+        # The same MACs recur on every discovery pass; memoize per address, cleared on reindex
+        self._cached_lookup = lru_cache(maxsize=4096)(self._lookup_vendor)
+        # mtime of the JSON the index was loaded from; at most one stat per RELOAD_CHECK_SEC
+        self._loaded_mtime: Optional[float] = None
+        self._next_mtime_check = 0.0
         self._load_database()
     
+    @property
+    def oui_data(self) -> Dict[str, Dict[str, str]]:
+        """Full OUI records; parsed from JSON on first use when startup came from the index"""
+        if self._oui_data is None:
+            self._oui_data = self._read_json()
+        return self._oui_data
+    
+    @oui_data.setter
+    def oui_data(self, value: Dict[str, Dict[str, str]]) -> None:
+        self._oui_data = value
+    
+    def _build_index(self) -> None:
+        """Index organizations by integer OUI for lookups"""
+        index = {}
+        for oui, data in self.oui_data.items():
+            try:
+                index[int(oui, 16)] = data['organization']
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._vendor_by_oui = index
+        self._cached_lookup.cache_clear()
+    
+    def _read_json(self) -> Dict[str, Dict[str, str]]:
+        """Parse the OUI JSON file straight from a read-only mapping"""
+        if not self.oui_file.exists():
+            return {}
+        with open(self.oui_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    
+    def _load_index(self) -> bool:
+        """Load the lookup index if it is at least as new as the JSON"""
+        try:
+            if self.index_file.stat().st_mtime < self.oui_file.stat().st_mtime:
+                return False
+            with open(self.index_file, 'rb') as f:
+                index = orjson.loads(f.read())
+            ouis, organizations = index['oui'], index['org']
+            if len(ouis) != len(organizations):
+                return False
+            self._vendor_by_oui = dict(zip(ouis, organizations))
+            self._cached_lookup.cache_clear()
+            return True
+        except Exception:
+            return False
+    
+    def _save_index(self) -> None:
+        """Persist the lookup index so later starts skip the JSON parse"""
+        try:
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps({
+                    'oui': list(self._vendor_by_oui.keys()),
+                    'org': list(self._vendor_by_oui.values())
+                }))
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning("Error saving OUI index: %s", e)
+    
+    def _file_mtime(self) -> Optional[float]:
+        """mtime of the OUI JSON, None when it is missing"""
+        try:
+            return self.oui_file.stat().st_mtime
+        except OSError:
+            return None
+    
+    def _reload_if_changed(self) -> None:
+        """Reload when the OUI JSON changed on disk since it was loaded"""
+        now = time.monotonic()
+        if now < self._next_mtime_check:
+            return
+        self._next_mtime_check = now + self.RELOAD_CHECK_SEC
+        if self._file_mtime() != self._loaded_mtime:
+            self._oui_data = None
+            self._load_database()
+    
     def _load_database(self) -> None:
         """Load OUI database from local file"""
+        self._loaded_mtime = self._file_mtime()
         if self.oui_file.exists():
+            if self._load_index():
+                logger.info("Loaded OUI index with %d entries", len(self._vendor_by_oui))
+                return
             try:
-                with open(self.oui_file, 'r') as f:
-                    self.oui_data = json.load(f)
-                print(f"Loaded OUI database with {len(self.oui_data)} entries")
+                self.oui_data = self._read_json()
+                self._build_index()
+                self._save_index()
+                logger.info("Loaded OUI database with %d entries", len(self.oui_data))
             except Exception as e:
-                print(f"Error loading OUI database: {e}")
+                logger.warning("Error loading OUI database: %s", e)
                 self.oui_data = {}
         else:
-            print("OUI database file not found, will create on first update")
+            logger.info("OUI database file not found, will create on first update")
             self.oui_data = {}
     
     def _save_database(self) -> None:
         """Save OUI database to local file"""
         try:
             self.resources_dir.mkdir(exist_ok=True)
-            with open(self.oui_file, 'w') as f:
-                json.dump(self.oui_data, f, indent=2)
-            print(f"Saved OUI database with {len(self.oui_data)} entries")
+            with open(self.oui_file, 'wb') as f:
+                f.write(orjson.dumps(self.oui_data, option=orjson.OPT_INDENT_2))
+            self._loaded_mtime = self._file_mtime()
+            self._save_index()
+            logger.info("Saved OUI database with %d entries", len(self.oui_data))
         except Exception as e:
-            print(f"Error saving OUI database: {e}")
+            logger.warning("Error saving OUI database: %s", e)
     
     def _parse_oui_line(self, line: str) -> Optional[Dict[str, str]]:
         """Parse a single line from IEEE OUI database"""
@@ -62,7 +168,7 @@ class OuiDatabase:
     
     def update_from_ieee(self) -> Dict[str, int]:
         """Update OUI database from IEEE standards website"""
-        print("Updating OUI database from IEEE standards...")
+        logger.info("Updating OUI database from IEEE standards...")
         
         # IEEE OUI database URLs - try different formats and sources
         urls = [
@@ -94,7 +200,7 @@ class OuiDatabase:
             from io import StringIO
             
             for url in urls:
-                print(f"Downloading from: {url}")
+                logger.debug("Downloading from: %s", url)
                 try:
                     response = requests.get(url, timeout=30)
                     response.raise_for_status()
@@ -161,13 +267,14 @@ class OuiDatabase:
                                         'full_oui': oui_hex
                                     }
                     
-                    print(f"Successfully processed {url}")
+                    logger.debug("Successfully processed %s", url)
                     
                 except requests.RequestException as e:
-                    print(f"Error downloading from {url}: {e}")
+                    logger.warning("Error downloading from %s: %s", url, e)
                     continue
             
             # Save the updated database
+            self._build_index()
             self._save_database()
             
             result = {
@@ -176,34 +283,39 @@ class OuiDatabase:
                 'total_entries': len(self.oui_data)
             }
             
-            print(f"OUI database update completed: {result}")
+            logger.info("OUI database update completed: %s", result)
             return result
             
         except requests.RequestException as e:
-            print(f"Error fetching OUI data from IEEE: {e}")
+            logger.warning("Error fetching OUI data from IEEE: %s", e)
             return {'error': str(e)}
         except Exception as e:
-            print(f"Error updating OUI database: {e}")
+            logger.warning("Error updating OUI database: %s", e)
             return {'error': str(e)}
     
     def lookup_vendor(self, mac_address: str) -> Optional[str]:
         """Look up vendor name from MAC address"""
         if not mac_address:
             return None
-        
-        # Clean MAC address (remove separators and convert to uppercase)
-        mac_clean = re.sub(r'[^0-9A-Fa-f]', '', mac_address).upper()
-        
-        if len(mac_clean) < 6:
+        self._reload_if_changed()
+        return self._cached_lookup(mac_address)
+    
+    def lookup_vendors(self, mac_addresses: Iterable[str]) -> Dict[str, Optional[str]]:
+        """lookup_vendor for many addresses, each distinct one looked up once"""
+        self._reload_if_changed()
+        return {mac: self._cached_lookup(mac) if mac else None for mac in set(mac_addresses)}
+    
+    def _lookup_vendor(self, mac_address: str) -> Optional[str]:
+        """Uncached lookup_vendor"""
+        # Get OUI (first 6 hex digits) as an integer key
+        oui = mac_address.translate(_MAC_SEPARATORS)[:6]
+        if not _HEX_DIGITS.issuperset(oui):
+            # Unusual formatting; drop every non-hex character instead
+            oui = re.sub(r'[^0-9A-Fa-f]', '', mac_address)[:6]
+        if len(oui) < 6:
             return None
         
-        # Get OUI (first 6 characters)
-        oui = mac_clean[:6]
-        
-        if oui in self.oui_data:
-            return self.oui_data[oui]['organization']
-        
-        return None
+        return self._vendor_by_oui.get(int(oui, 16))
     
     def get_database_stats(self) -> Dict[str, int]:
         """Get database statistics"""
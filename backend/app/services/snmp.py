@@ -1,6 +1,7 @@
 import asyncio
 import ipaddress
-from typing import Any, Dict, List, Optional
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import socket
 import subprocess
 import re
@@ -9,6 +10,132 @@ import threading
 from .oui_database import oui_db
 
 
+# Minimal SNMPv2c GET over UDP, spoken in-process instead of forking snmpget.
+# BER tags used by GetRequest/Response PDUs
+_BER_INTEGER = 0x02
+_BER_OCTET_STRING = 0x04
+_BER_NULL = 0x05
+_BER_OID = 0x06
+_BER_SEQUENCE = 0x30
+_PDU_GET_REQUEST = 0xA0
+_PDU_RESPONSE = 0xA2
+
+
+def _ber(tag: int, payload: bytes) -> bytes:
+    """Encode one BER TLV"""
+    length = len(payload)
+    if length < 0x80:
+        return bytes([tag, length]) + payload
+    size = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([tag, 0x80 | len(size)]) + size + payload
+
+
+def _ber_int(value: int) -> bytes:
+    return _ber(_BER_INTEGER, value.to_bytes(value.bit_length() // 8 + 1, 'big', signed=True))
+
+
+def _ber_oid(oid: str) -> bytes:
+    parts = [int(p) for p in oid.strip('.').split('.')]
+    body = bytearray([40 * parts[0] + parts[1]])
+    for part in parts[2:]:
+        chunk = [part & 0x7F]
+        part >>= 7
+        while part:
+            chunk.append(0x80 | (part & 0x7F))
+            part >>= 7
+        body.extend(reversed(chunk))
+    return _ber(_BER_OID, bytes(body))
+
+
+def _ber_items(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """Yield (tag, value_start, value_end) for each TLV in data[start:end]"""
+    pos = start
+    while pos < end:
+        tag, length = data[pos], data[pos + 1]
+        pos += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[pos:pos + size], 'big')
+            pos += size
+        yield tag, pos, pos + length
+        pos += length
+
+
+def _decode_oid(body: bytes) -> str:
+    parts = [body[0] // 40, body[0] % 40]
+    value = 0
+    for byte in body[1:]:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            parts.append(value)
+            value = 0
+    return '.'.join(map(str, parts))
+
+
+def encode_get_request(community: str, oids: List[str], request_id: int) -> bytes:
+    """Build an SNMPv2c GetRequest message for oids"""
+    varbinds = b''.join(_ber(_BER_SEQUENCE, _ber_oid(oid) + _ber(_BER_NULL, b'')) for oid in oids)
+    pdu = _ber(_PDU_GET_REQUEST, _ber_int(request_id) + _ber_int(0) + _ber_int(0) + _ber(_BER_SEQUENCE, varbinds))
+    return _ber(_BER_SEQUENCE, _ber_int(1) + _ber(_BER_OCTET_STRING, community.encode()) + pdu)
+
+
+def decode_get_response(data: bytes, request_id: int) -> Optional[List[Any]]:
+    """Values from a Response matching request_id; None for varbinds without a value"""
+    try:
+        _, start, end = next(_ber_items(data, 0, len(data)))
+        _, _, (tag, start, end) = _ber_items(data, start, end)
+        if tag != _PDU_RESPONSE:
+            return None
+        (_, a, b), (_, c, d), _, (_, start, end) = _ber_items(data, start, end)
+        if int.from_bytes(data[a:b], 'big', signed=True) != request_id or any(data[c:d]):
+            return None
+        values = []
+        for _, vb_start, vb_end in _ber_items(data, start, end):
+            _, (tag, a, b) = _ber_items(data, vb_start, vb_end)
+            if tag == _BER_OCTET_STRING:
+                values.append(data[a:b].decode('utf-8', errors='replace'))
+            elif tag == _BER_OID:
+                values.append(_decode_oid(data[a:b]))
+            elif tag == _BER_INTEGER:
+                values.append(int.from_bytes(data[a:b], 'big', signed=True))
+            else:
+                # NULL, noSuchObject, noSuchInstance, endOfMibView
+                values.append(None)
+        return values
+    except (ValueError, IndexError, StopIteration):
+        return None
+
+
+class _SnmpResponseProtocol(asyncio.DatagramProtocol):
+    def __init__(self, request_id: int):
+        self.request_id = request_id
+        self.response: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        values = decode_get_response(data, self.request_id)
+        if values is not None and not self.response.done():
+            self.response.set_result(values)
+
+
+async def snmp_get(target: str, oids: List[str], community: str = 'public', timeout: float = 1.0) -> Optional[List[Any]]:
+    """Fetch oids from target in one SNMPv2c GET; None on timeout or error"""
+    request_id = random.randint(1, 0x7FFFFFFF)
+    loop = asyncio.get_running_loop()
+    try:
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _SnmpResponseProtocol(request_id), remote_addr=(target, 161)
+        )
+    except OSError:
+        return None
+    try:
+        transport.sendto(encode_get_request(community, oids, request_id))
+        return await asyncio.wait_for(protocol.response, timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        transport.close()
+
+
 class SnmpClient:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
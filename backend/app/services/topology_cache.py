@@ -0,0 +1,31 @@
+import time
+from typing import Hashable, Optional, Tuple
+
+
+class TopologyCache:
+    """Short-lived cache for the serialized /topology payload"""
+
+    def __init__(self, ttl_seconds: float = 2.0):
+        self.ttl_seconds = ttl_seconds
+        self._entry: Optional[Tuple[Hashable, float, bytes]] = None
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached topology body if it was built for key and is still fresh"""
+        entry = self._entry
+        if entry is None or entry[0] != key:
+            return None
+        if time.monotonic() - entry[1] >= self.ttl_seconds:
+            return None
+        return entry[2]
+
+    def set(self, key: Hashable, topology: bytes) -> None:
+        """Store the encoded topology built for key"""
+        self._entry = (key, time.monotonic(), topology)
+
+    def invalidate(self) -> None:
+        """Drop the cached topology after devices or edges are written"""
+        self._entry = None
+
+
+# Global cache instance
+topology_cache = TopologyCache()
@@ -35,3 +35,19 @@ def test_topology_empty(mock_add_router):
     assert data["edges"] == []
 
 
+
+def test_discover_coalesces_concurrent_requests():
+    """A second POST while discovery is running does not start another one"""
+    import asyncio
+    from app.routers import topology
+
+    async def slow_discovery(*args, **kwargs):
+        await asyncio.sleep(0.2)
+
+    with patch.object(topology._discovery_service, "run_discovery", side_effect=slow_discovery) as mock_run:
+        with TestClient(app) as client:
+            first = client.post("/topology/discover")
+            second = client.post("/topology/discover")
+            assert first.json()["status"] == "discovery_started"
+            assert second.json()["status"] == "already_running"
+    assert mock_run.call_count == 1
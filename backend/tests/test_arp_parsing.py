@@ -0,0 +1,29 @@
+from app.services.fast_discovery import FastDiscoveryService, NeighborEntry
+
+
+def test_parse_arp_skips_incomplete_and_multicast_entries():
+    lines = [
+        "? (192.168.1.1) at 28:80:88:34:f1:79 on en0 ifscope [ethernet]",
+        "router.lan (192.168.1.254) at aa:bb:cc:dd:ee:ff [ether] on eth0",
+        "? (224.0.0.251) at 1:0:5e:0:0:fb on en0 ifscope permanent [ethernet]",
+        "? (192.168.1.9) at (incomplete) on en0 ifscope [ethernet]",
+        "",
+    ]
+    devices = FastDiscoveryService._parse_arp(lines)
+    assert devices == [
+        NeighborEntry("192.168.1.1", "28:80:88:34:f1:79", "192.168.1.1", "arp"),
+        NeighborEntry("192.168.1.254", "aa:bb:cc:dd:ee:ff", "router.lan", "arp"),
+    ]
+
+
+def test_parse_proc_arp_keeps_complete_entries_only():
+    lines = [
+        "IP address       HW type     Flags       HW address            Mask     Device\n",
+        "192.168.1.1      0x1         0x2         28:80:88:34:f1:79     *        eth0\n",
+        "192.168.1.9      0x1         0x0         00:00:00:00:00:00     *        eth0\n",
+        "224.0.0.251      0x1         0x6         01:00:5e:00:00:fb     *        eth0\n",
+    ]
+    devices = FastDiscoveryService._parse_proc_arp(lines)
+    assert devices == [
+        NeighborEntry("192.168.1.1", "28:80:88:34:f1:79", "192.168.1.1", "arp"),
+    ]
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from app.services.device_cache import DeviceCache
+
+
+def test_entries_expire_individually_and_size_is_capped(tmp_path):
+    cache = DeviceCache(cache_duration_minutes=5, max_entries=3, cache_file=str(tmp_path / "cache.json"))
+    try:
+        for i in range(5):
+            cache.update_device({"id": str(i)})
+        assert list(cache.devices_cache) == ["2", "3", "4"]
+
+        cache._cached_at["3"] -= timedelta(minutes=6)
+        assert [d["id"] for d in cache.get_cached_devices()] == ["2", "4"]
+        assert cache.get_device("3") is None
+        assert cache.get_device("4") == {"id": "4"}
+    finally:
+        cache.close()
+    assert not cache._writer.is_alive()
+    assert (tmp_path / "cache.json").exists()
+
+
+def test_version_changes_with_every_mutation(tmp_path):
+    cache = DeviceCache(cache_file=str(tmp_path / "cache.json"))
+    try:
+        cache.update_cache([{"id": "a"}, {"id": "b"}])
+        version = cache.version
+        cache.remove_device("a")
+        assert cache.version > version
+        version = cache.version
+        cache.remove_device("missing")
+        assert cache.version == version
+    finally:
+        cache.close()
@@ -0,0 +1,10 @@
+from app.services.fast_discovery import FastDiscoveryService
+
+
+def test_model_patterns_keep_list_priority():
+    service = FastDiscoveryService.__new__(FastDiscoveryService)
+    # "Switch" sits earlier in the text, but the Router pattern comes first in the list
+    assert service._parse_model_from_sysdescr("Cisco Switch and Orbi Router") == "Orbi"
+    assert service._parse_model_from_sysdescr("Linux 5 kernel") == "Linux"
+    assert service._parse_model_from_sysdescr("no model here") == "Unknown"
+    assert service._parse_model_from_html("<p>Product: X1</p>\n<p>Model: R7000</p>") == "R7000"
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from app.routers.topology import _is_router_device
+
+
+def _device(mgmt_ip=None, vendor=None, hostname=None):
+    return SimpleNamespace(mgmt_ip=mgmt_ip, vendor=vendor, hostname=hostname)
+
+
+def test_gateway_ip_is_router():
+    assert _is_router_device(_device(mgmt_ip="192.168.1.1"))
+    assert not _is_router_device(_device(mgmt_ip="192.168.1.10"))
+
+
+def test_router_vendor_is_case_insensitive():
+    assert _is_router_device(_device(mgmt_ip="10.0.0.5", vendor="NETGEAR"))
+    assert not _is_router_device(_device(mgmt_ip="10.0.0.5", vendor="Apple"))
+
+
+def test_router_hostname_patterns():
+    assert _is_router_device(_device(hostname="Office-Gateway"))
+    assert _is_router_device(_device(hostname="ap-lobby"))
+    assert not _is_router_device(_device(hostname="laptop"))
+    assert not _is_router_device(_device())
@@ -0,0 +1,9 @@
+from app.scheduler import DISCOVERY_BASE_INTERVAL_SEC, DISCOVERY_MAX_INTERVAL_SEC, next_discovery_interval
+
+
+def test_interval_backs_off_while_idle_and_resets_on_change():
+    interval = DISCOVERY_BASE_INTERVAL_SEC
+    for _ in range(10):
+        interval = next_discovery_interval(interval, changed=False)
+    assert interval == DISCOVERY_MAX_INTERVAL_SEC
+    assert next_discovery_interval(interval, changed=True) == DISCOVERY_BASE_INTERVAL_SEC
@@ -0,0 +1,23 @@
+from app.services.snmp import (
+    _BER_OCTET_STRING, _BER_SEQUENCE, _PDU_RESPONSE, _ber, _ber_int, _ber_oid,
+    decode_get_response, encode_get_request,
+)
+
+
+def test_get_request_encoding():
+    request = encode_get_request("public", ["1.3.6.1.2.1.1.1.0"], 1234)
+    assert request.hex() == (
+        "302702010104067075626c6963a01a020204d2020100020100"
+        "300e300c06082b060102010101000500"
+    )
+
+
+def test_decode_response_matches_request_id():
+    varbinds = (
+        _ber(_BER_SEQUENCE, _ber_oid("1.3.6.1.2.1.1.1.0") + _ber(_BER_OCTET_STRING, b"Orbi Router"))
+        + _ber(_BER_SEQUENCE, _ber_oid("1.3.6.1.2.1.1.2.0") + _ber_oid("1.3.6.1.4.1.4526.100"))
+    )
+    pdu = _ber_int(7) + _ber_int(0) + _ber_int(0) + _ber(_BER_SEQUENCE, varbinds)
+    response = _ber(_BER_SEQUENCE, _ber_int(1) + _ber(_BER_OCTET_STRING, b"public") + _ber(_PDU_RESPONSE, pdu))
+    assert decode_get_response(response, 7) == ["Orbi Router", "1.3.6.1.4.1.4526.100"]
+    assert decode_get_response(response, 8) is None
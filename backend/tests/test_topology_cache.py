@@ -0,0 +1,19 @@
+from app.services.topology_cache import TopologyCache
+
+
+def test_cache_hit_requires_matching_key():
+    cache = TopologyCache(ttl_seconds=60)
+    cache.set(("t1", 2), b'{"nodes":[],"edges":[]}')
+    assert cache.get(("t1", 2)) == b'{"nodes":[],"edges":[]}'
+    assert cache.get(("t1", 3)) is None
+
+
+def test_cache_expires_and_invalidates():
+    cache = TopologyCache(ttl_seconds=0)
+    cache.set("k", b'{"nodes":[],"edges":[]}')
+    assert cache.get("k") is None
+
+    cache = TopologyCache(ttl_seconds=60)
+    cache.set("k", b'{"nodes":[],"edges":[]}')
+    cache.invalidate()
+    assert cache.get("k") is None